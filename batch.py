@@ -0,0 +1,142 @@
+import argparse
+import contextlib
+import csv
+import glob
+import json
+import os
+import signal
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from mapparser import MapParseError, parse_input_file
+from searchstrategy import STRATEGIES, ITERATIVE_METHODS, solve
+from tour import solve_tour
+
+FIELDS = ["map", "method", "multiple", "status", "goals_found", "path_length",
+          "nodes_visited", "iterations", "wall_time", "error"]
+
+
+class TaskTimeout(Exception):
+    pass
+
+
+def _raise_timeout(signum, frame):
+    raise TaskTimeout()
+
+
+@contextlib.contextmanager
+def time_limit(seconds):
+    """Raise TaskTimeout inside the block once seconds have passed (no limit if falsy or unsupported)."""
+    # The alarm interrupts the search itself, so a slow task cannot hold its worker forever
+    use_alarm = seconds and hasattr(signal, "setitimer")
+    if use_alarm:
+        signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+
+def find_maps(pattern):
+    """Expand a directory, glob pattern or single file into a sorted list of map files."""
+    if os.path.isdir(pattern):
+        return sorted(glob.glob(os.path.join(pattern, "*.txt")))
+    if os.path.isfile(pattern):
+        return [pattern]
+    return sorted(path for path in glob.glob(pattern) if os.path.isfile(path))
+
+
+def solve_task(input_file, method, find_multiple_paths=False, timeout=None):
+    """Solve one (map, method) pair and return its result row. Runs in a worker process."""
+    row = dict.fromkeys(FIELDS)
+    row.update(map=input_file, method=method, multiple=find_multiple_paths)
+    start = time.perf_counter()
+    try:
+        with time_limit(timeout):
+            rows, cols, marker, goals, walls = parse_input_file(input_file)
+            if find_multiple_paths:
+                result = solve_tour(method, marker, goals, walls, rows, cols)
+            else:
+                result = solve(method, marker, goals, walls, rows, cols)
+        row["wall_time"] = round(time.perf_counter() - start, 6)
+        path = result[0]
+        found = set(path) & set(goals)
+        row["goals_found"] = len(found)
+        row["path_length"] = len(result[2])
+        row["nodes_visited"] = result[1]
+        if method in ITERATIVE_METHODS:
+            row["iterations"] = result[5]
+        if not found:
+            row["status"] = "no_path"
+        elif find_multiple_paths and len(found) < len(set(goals)):
+            row["status"] = "partial"
+        else:
+            row["status"] = "ok"
+    except TaskTimeout:
+        row["status"] = "timeout"
+        row["wall_time"] = round(time.perf_counter() - start, 6)
+    except (MapParseError, OSError) as e:
+        row["status"] = "error"
+        row["error"] = str(e)
+    except Exception as e:
+        row["status"] = "error"
+        row["error"] = f"{type(e).__name__}: {e}"
+    return row
+
+
+def run_batch(maps, methods, workers=None, timeout=None, find_multiple_paths=False):
+    """Solve every (map, method) pair in a process pool, yielding rows in submission order."""
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(solve_task, input_file, method, find_multiple_paths, timeout)
+                   for input_file in maps for method in methods]
+        for future in futures:
+            yield future.result()
+
+
+def write_rows(rows, output, output_format):
+    """Stream result rows to output as JSON Lines or CSV."""
+    if output_format == "csv":
+        writer = csv.DictWriter(output, fieldnames=FIELDS)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+            output.flush()
+    else:
+        for row in rows:
+            output.write(json.dumps(row) + "\n")
+            output.flush()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="script.py batch",
+                                     description="Solve every map in a directory or glob with one or more methods.")
+    parser.add_argument("maps", help="directory of .txt maps, glob pattern or single map file")
+    parser.add_argument("methods", nargs="*", help=f"methods to run (default: all of {', '.join(STRATEGIES)})")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--timeout", type=float, default=None, help="seconds allowed per (map, method) task")
+    parser.add_argument("--multiple", action="store_true", help="visit every goal instead of the first one")
+    parser.add_argument("--output", help="result file (default: standard output)")
+    parser.add_argument("--format", choices=("jsonl", "csv"), help="output format (default: from --output, else jsonl)")
+    args = parser.parse_args(argv)
+
+    methods = [method.upper() for method in args.methods] or list(STRATEGIES)
+    unknown = [method for method in methods if method not in STRATEGIES]
+    if unknown:
+        parser.error(f"Method(s) not supported: {', '.join(unknown)}")
+    maps = find_maps(args.maps)
+    if not maps:
+        parser.error(f"No map files match '{args.maps}'")
+    output_format = args.format or ("csv" if args.output and args.output.endswith(".csv") else "jsonl")
+
+    rows = run_batch(maps, methods, args.workers, args.timeout, args.multiple)
+    if args.output:
+        with open(args.output, "w", newline="") as output:
+            write_rows(rows, output, output_format)
+    else:
+        write_rows(rows, sys.stdout, output_format)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+import argparse
+import functools
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+import mapgen
+from batch import TaskTimeout, time_limit
+from indexedheap import IndexedHeap
+from mapparser import parse_input_file
+from searchstrategy import HEAP_METHODS, STRATEGIES, UNREACHED
+from wavefront import distance_field
+
+DEFAULT_SIZES = (10, 50, 200)
+
+# (forward, bidirectional) method pairs whose explored cells are compared after the table
+BIDIRECTIONAL_PAIRS = (("BFS", "BBFS"), ("AS", "BAS"))
+
+# Runs faster than this in the baseline are too noisy to compare rates
+MIN_COMPARE_TIME = 0.05
+
+
+class HeapTracker:
+    """heap= factory for the strategies that remembers its heaps so the largest open list can be reported."""
+
+    def __init__(self):
+        self.heaps = []
+
+    def __call__(self):
+        heap = IndexedHeap()
+        self.heaps.append(heap)
+        return heap
+
+    def max_size(self):
+        return max((heap.max_size for heap in self.heaps), default=None)
+
+
+def measure(search, *args):
+    """Run search(*args) and return its result, wall time and peak traced memory."""
+    tracemalloc.start()
+    try:
+        start = time.perf_counter()
+        result = search(*args)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        # A timeout inside the search must not leave tracing on for the later cases
+        tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def run_case(method, spec, grid, optimal, repeat=1, timeout=None, memory=True):
+    """Benchmark one method on one generated map and return its result row."""
+    args = (spec.marker, spec.goals, grid, spec.rows, spec.cols)
+    row = {"method": method, "status": "ok", "optimal": optimal}
+    tracker = HeapTracker()
+    search = STRATEGIES[method]
+    if method in HEAP_METHODS:
+        search = functools.partial(search, heap=tracker)
+    try:
+        best = None
+        # Best of repeat untraced runs for the rate, tracemalloc slows the search down
+        for _ in range(repeat):
+            if tracemalloc.is_tracing():
+                tracemalloc.stop()  # Timed runs are meant to be untraced
+            tracker.heaps.clear()
+            with time_limit(timeout):
+                start = time.perf_counter()
+                result = search(*args)
+                elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        if memory:
+            with time_limit(timeout):
+                _, _, peak = measure(search, *args)
+            row["peak_kib"] = round(peak / 1024)
+    except TaskTimeout:
+        row["status"] = "timeout"
+        return row
+
+    path = result[0]
+    row["nodes"] = result[1]
+    row["time"] = round(best, 6)
+    row["nodes_per_s"] = round(result[1] / best) if best else None
+    row["max_heap"] = tracker.max_size()
+    if path and path[-1] in spec.goals:
+        row["path"] = len(result[2])
+        row["gap"] = row["path"] - optimal if optimal is not None else None
+    elif optimal is not None:
+        row["status"] = "no_path"
+    return row
+
+
+def run_suite(families, sizes, methods, seed=0, repeat=1, timeout=None, memory=True):
+    """Yield a result row for every (family, size, method) combination."""
+    for family in families:
+        for size in sizes:
+            spec = mapgen.generate(family, size, size, seed)
+            grid = spec.grid()
+            # True shortest path length for the optimality check
+            distance = distance_field(grid, grid.index(spec.marker))[grid.index(spec.goals[0])]
+            optimal = distance if distance != UNREACHED else None
+            for method in methods:
+                row = {"family": family, "size": size}
+                row.update(run_case(method, spec, grid, optimal, repeat, timeout, memory))
+                yield row
+
+
+def run_parse(families, sizes, seed=0, repeat=1):
+    """Yield a parse timing row per generated map; nodes counts wall rectangles."""
+    with tempfile.TemporaryDirectory() as directory:
+        for family in families:
+            for size in sizes:
+                spec = mapgen.generate(family, size, size, seed)
+                path = os.path.join(directory, f"{family}-{size}.txt")
+                spec.write(path)
+                best = min(measure_time(parse_input_file, path) for _ in range(repeat))
+                yield {"family": family, "size": size, "method": "PARSE", "status": "ok",
+                       "nodes": len(spec.walls), "time": round(best, 6),
+                       "nodes_per_s": round(len(spec.walls) / best) if best else None}
+
+
+def measure_time(function, *args):
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+def compare(results, baseline, tolerance):
+    """Return regression messages for results measured against baseline rows."""
+    previous = {(row["family"], row["size"], row["method"]): row for row in baseline}
+    problems = []
+    for row in results:
+        key = (row["family"], row["size"], row["method"])
+        old = previous.get(key)
+        if old is None:
+            continue
+        name = f"{row['method']} on {row['family']} {row['size']}x{row['size']}"
+        if row["status"] == "timeout" and old["status"] != "timeout":
+            problems.append(f"{name}: timed out (baseline {old['time']:.3f}s)")
+            continue
+        if row["status"] != "ok" or old["status"] != "ok":
+            continue
+        if old.get("gap") == 0 and row.get("gap"):
+            problems.append(f"{name}: path is {row['gap']} steps longer than optimal (baseline was optimal)")
+        if old["time"] >= MIN_COMPARE_TIME and old["nodes_per_s"]:
+            ratio = row["nodes_per_s"] / old["nodes_per_s"]
+            if ratio < 1 - tolerance:
+                problems.append(f"{name}: {row['nodes_per_s']} nodes/s is {1 - ratio:.0%} slower "
+                                f"than the baseline {old['nodes_per_s']}")
+    return problems
+
+
+def print_reductions(results):
+    """Print how many fewer cells each bidirectional method expands than its forward version."""
+    nodes = {(row["family"], row["size"], row["method"]): row.get("nodes") for row in results}
+    lines = []
+    for (family, size, method), forward in nodes.items():
+        for forward_method, bidirectional_method in BIDIRECTIONAL_PAIRS:
+            both = nodes.get((family, size, bidirectional_method))
+            if method == forward_method and forward and both is not None:
+                change = 1 - both / forward
+                lines.append(f"{family:<10}{size:>6}  {bidirectional_method:<5} {both:>10} vs {forward_method:<5}"
+                             f"{forward:>10}  {abs(change):>6.0%} {'fewer' if change >= 0 else 'more'}")
+    if lines:
+        print()
+        print("Explored cells, bidirectional vs forward search:")
+        for line in lines:
+            print(line)
+
+
+def print_row(row):
+    def cell(key, width, spec=""):
+        value = row.get(key)
+        return f"{'-' if value is None else format(value, spec):>{width}}"
+    print(f"{row['family']:<10}{row['size']:>6}  {row['method']:<7}{row['status']:<9}"
+          f"{cell('path', 9)}{cell('gap', 6)}{cell('nodes', 11)}{cell('nodes_per_s', 12)}"
+          f"{cell('max_heap', 10)}{cell('peak_kib', 11)}{cell('time', 10, '.3f')}")
+
+
+def parse_list(text, convert=str):
+    return [convert(item) for item in text.split(",") if item]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark every search strategy on generated maps.")
+    parser.add_argument("--families", type=parse_list, default=list(mapgen.FAMILIES),
+                        help=f"comma separated map families (default: {','.join(mapgen.FAMILIES)})")
+    parser.add_argument("--sizes", type=lambda text: parse_list(text, int), default=list(DEFAULT_SIZES),
+                        help="comma separated map sizes, e.g. 10,100,2000 (default: 10,50,200)")
+    parser.add_argument("--methods", type=lambda text: parse_list(text.upper()), default=list(STRATEGIES),
+                        help="comma separated methods (default: all)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case, the fastest counts")
+    parser.add_argument("--timeout", type=float, default=30, help="seconds allowed per run")
+    parser.add_argument("--no-memory", dest="memory", action="store_false", help="skip the tracemalloc run")
+    parser.add_argument("--parse", action="store_true",
+                        help="time parse_input_file on the generated maps instead of searching (Nodes = wall rectangles)")
+    parser.add_argument("--save", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="JSON results to compare against; regressions exit with status 1")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed nodes/s slowdown (default: 0.2)")
+    args = parser.parse_args(argv)
+
+    for family in args.families:
+        if family not in mapgen.FAMILIES:
+            parser.error(f"Unknown map family '{family}'")
+    for method in args.methods:
+        if method not in STRATEGIES:
+            parser.error(f"Method not supported: {method}")
+
+    print(f"{'Map':<10}{'Size':>6}  {'Method':<7}{'Status':<9}{'Path':>9}{'Gap':>6}{'Nodes':>11}"
+          f"{'Nodes/s':>12}{'Max heap':>10}{'Peak KiB':>11}{'Time (s)':>10}")
+    results = []
+    if args.parse:
+        rows = run_parse(args.families, args.sizes, args.seed, args.repeat)
+    else:
+        rows = run_suite(args.families, args.sizes, args.methods, args.seed, args.repeat, args.timeout, args.memory)
+    for row in rows:
+        print_row(row)
+        sys.stdout.flush()
+        results.append(row)
+    print_reductions(results)
+
+    if args.save:
+        with open(args.save, "w") as file:
+            json.dump({"python": platform.python_version(), "seed": args.seed, "results": results}, file, indent=1)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)["results"]
+        problems = compare(results, baseline, args.tolerance)
+        print()
+        if problems:
+            print(f"{len(problems)} regression(s) against {args.baseline}:")
+            for problem in problems:
+                print(f"  {problem}")
+            sys.exit(1)
+        print(f"No regressions against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
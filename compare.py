@@ -0,0 +1,162 @@
+import argparse
+import csv
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from batch import TaskTimeout, time_limit
+from compiledmap import CACHE_SUFFIX, cache_is_valid, compile_map, is_compiled, load_compiled
+from instrument import Stats
+from mapparser import MapParseError
+from searchstrategy import STRATEGIES, UNREACHED, solve
+from tour import solve_tour
+from wavefront import wavefront
+
+# The six methods of the assignment, compared by default
+DEFAULT_METHODS = ("DFS", "BFS", "GBFS", "AS", "CUS1", "CUS2")
+
+FIELDS = ["method", "status", "goal", "path_length", "gap", "expanded", "max_frontier", "wall_time", "error"]
+
+# Map loaded once per worker process by _load_map
+_shared = None
+
+
+def shared_map(input_file):
+    """Path of a compiled form of input_file for the workers, and whether it is a temporary file.
+
+    Reuses (or refreshes) the compiled cache next to a text map, and falls back
+    to a temporary file when that directory cannot be written.
+    """
+    if is_compiled(input_file):
+        return input_file, False
+    compiled = input_file + CACHE_SUFFIX
+    if cache_is_valid(input_file, compiled):
+        return compiled, False
+    try:
+        return compile_map(input_file, compiled), False
+    except OSError:
+        descriptor, compiled = tempfile.mkstemp(suffix=CACHE_SUFFIX)
+        os.close(descriptor)
+        return compile_map(input_file, compiled), True
+
+
+def _load_map(compiled):
+    # Worker initializer: every task of the worker reuses the same memory-mapped map
+    global _shared
+    _shared = load_compiled(compiled)
+
+
+def compare_task(method, find_multiple_paths=False, timeout=None):
+    """Run one method on the worker's shared map and return its result row.
+
+    wall_time comes from a plain run. expanded and max_frontier come from a
+    second run with an instrument.Stats observer, so the counters do not slow down the timing.
+    """
+    rows, cols, marker, goals, grid = _shared
+    row = dict.fromkeys(FIELDS)
+    row["method"] = method
+    try:
+        with time_limit(timeout):
+            start = time.perf_counter()
+            if find_multiple_paths:
+                result = solve_tour(method, marker, goals, grid, rows, cols)
+            else:
+                result = solve(method, marker, goals, grid, rows, cols)
+            row["wall_time"] = round(time.perf_counter() - start, 6)
+            stats = Stats()
+            if find_multiple_paths:
+                solve_tour(method, marker, goals, grid, rows, cols, stats)
+            else:
+                solve(method, marker, goals, grid, rows, cols, False, stats)
+        path = result[0]
+        found = set(path) & set(goals)
+        row["expanded"] = stats.expanded
+        row["max_frontier"] = stats.max_frontier
+        if not found:
+            row["status"] = "no_path"
+        else:
+            row["status"] = "ok" if not find_multiple_paths or len(found) == len(set(goals)) else "partial"
+            row["goal"] = path[-1]
+            row["path_length"] = len(result[2])
+    except TaskTimeout:
+        row["status"] = "timeout"
+    except Exception as e:
+        row["status"] = "error"
+        row["error"] = f"{type(e).__name__}: {e}"
+    return row
+
+
+def run_compare(input_file, methods, find_multiple_paths=False, workers=None, timeout=None):
+    """Compare methods on one map in a process pool sharing its compiled form; returns the rows.
+
+    gap is the path length minus the shortest possible path to the goal that
+    was reached. Tours have no cheap optimum, so with find_multiple_paths it
+    is measured against the shortest complete tour among the compared methods.
+    """
+    compiled, temporary = shared_map(input_file)
+    try:
+        with ProcessPoolExecutor(max_workers=workers or min(len(methods), os.cpu_count() or 1),
+                                 initializer=_load_map, initargs=(compiled,)) as executor:
+            futures = [executor.submit(compare_task, method, find_multiple_paths, timeout) for method in methods]
+            rows = [future.result() for future in futures]
+        _, cols, marker, _, grid = load_compiled(compiled)
+    finally:
+        if temporary:
+            os.remove(compiled)
+
+    if find_multiple_paths:
+        best = min((row["path_length"] for row in rows if row["status"] == "ok"), default=None)
+        for row in rows:
+            if row["status"] == "ok":
+                row["gap"] = row["path_length"] - best
+    else:
+        distance = wavefront(grid, [grid.index(marker)])[0]
+        for row in rows:
+            if row["goal"] is not None and distance[grid.index(row["goal"])] != UNREACHED:
+                row["gap"] = row["path_length"] - distance[grid.index(row["goal"])]
+    return rows
+
+
+def print_table(rows):
+    print(f"{'Method':<8}{'Status':<9}{'Goal':>12}{'Path':>8}{'Gap':>6}{'Expanded':>10}{'Frontier':>10}{'Time (s)':>10}")
+    for row in rows:
+        def cell(key, width, spec=""):
+            value = row.get(key)
+            return f"{'-' if value is None else format(value, spec):>{width}}"
+        print(f"{row['method']:<8}{row['status']:<9}{str(row['goal'] or '-'):>12}{cell('path_length', 8)}"
+              f"{cell('gap', 6)}{cell('expanded', 10)}{cell('max_frontier', 10)}{cell('wall_time', 10, '.4f')}")
+        if row["error"]:
+            print(f"  {row['error']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="script.py compare",
+                                     description="Run several methods on one map in parallel and compare them.")
+    parser.add_argument("input_file")
+    parser.add_argument("methods", nargs="*", help=f"methods to compare (default: {' '.join(DEFAULT_METHODS)})")
+    parser.add_argument("--multiple", action="store_true", help="visit every goal instead of the first one")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: one per method, up to the CPU count)")
+    parser.add_argument("--timeout", type=float, default=None, help="seconds allowed per method")
+    parser.add_argument("--csv", metavar="PATH", help="also write the table as CSV")
+    args = parser.parse_args(argv)
+
+    methods = [method.upper() for method in args.methods] or list(DEFAULT_METHODS)
+    unknown = [method for method in methods if method not in STRATEGIES]
+    if unknown:
+        parser.error(f"Method(s) not supported: {', '.join(unknown)}")
+    try:
+        rows = run_compare(args.input_file, methods, args.multiple, args.workers, args.timeout)
+    except (MapParseError, OSError) as e:
+        print(f"Error: Unable to parse the map. {e}")
+        sys.exit(1)
+    print_table(rows)
+    if args.csv:
+        with open(args.csv, "w", newline="") as output:
+            writer = csv.DictWriter(output, fieldnames=FIELDS)
+            writer.writeheader()
+            writer.writerows(rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from gridmap import Grid
+from mapparser import MapParseError, parse_input_file
+
+# Compiled maps are written next to their text source as <source><CACHE_SUFFIX>
+CACHE_SUFFIX = ".mapc"
+
+MAGIC = b"GMAP"
+FORMAT_VERSION = 1
+HAS_LABELS = 1
+
+# magic, format version, flags, rows, cols, marker col, marker row, goal count, component count,
+# then the source's mtime (ns), size and blake2b digest for cache validation
+HEADER = struct.Struct("<4sHHIIIIIIQQ16s")
+
+
+def _digest(path):
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(1 << 20), b""):
+            digest.update(block)
+    return digest.digest()
+
+
+def pack_cells(cells):
+    """Pack a one-byte-per-cell wall array into a bitmap, eight cells per byte, lowest bit first."""
+    padded = bytes(cells) + bytes(-len(cells) % 8)
+    # Bit k of every output byte comes from every eighth cell starting at k; the 0/1 bytes never carry
+    value = 0
+    for bit in range(8):
+        value |= int.from_bytes(padded[bit::8], "little") << bit
+    return value.to_bytes(len(padded) // 8, "little")
+
+
+def unpack_cells(bitmap, size):
+    """Expand a bitmap from pack_cells back into a bytearray of size 0/1 cells."""
+    value = int.from_bytes(bitmap, "little")
+    ones = int.from_bytes(b"\x01" * len(bitmap), "little")
+    cells = bytearray(len(bitmap) * 8)
+    for bit in range(8):
+        cells[bit::8] = ((value >> bit) & ones).to_bytes(len(bitmap), "little")
+    del cells[size:]
+    return cells
+
+
+def compile_map(input_file, output=None, labels=True):
+    """Parse a text map and write its compiled form; returns the output path."""
+    output = output or input_file + CACHE_SUFFIX
+    stat = os.stat(input_file)
+    rows, cols, marker, goals, grid = parse_input_file(input_file)
+    flags = 0
+    component_count = 0
+    if labels:
+        flags |= HAS_LABELS
+        grid.components()
+        component_count = grid.component_count
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, flags, rows, cols, marker[0], marker[1], len(goals),
+                         component_count, stat.st_mtime_ns, stat.st_size, _digest(input_file))
+    # Write to a unique temporary file first so neither a reader nor another compile sees it half-written
+    handle, temporary = tempfile.mkstemp(suffix=".tmp", prefix=os.path.basename(output) + ".",
+                                         dir=os.path.dirname(output) or ".")
+    try:
+        with os.fdopen(handle, "wb") as file:
+            file.write(header)
+            file.write(struct.pack(f"<{2 * len(goals)}I", *(value for goal in goals for value in goal)))
+            file.write(pack_cells(grid.cells))
+            if labels:
+                file.write(bytes(-file.tell() % 4))  # Align the labels for a zero-copy int view
+                values = grid.components()
+                if sys.byteorder != "little":
+                    values = array('i', values)
+                    values.byteswap()
+                file.write(values.tobytes())
+        os.replace(temporary, output)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+    return output
+
+
+def is_compiled(path):
+    with open(path, "rb") as file:
+        return file.read(len(MAGIC)) == MAGIC
+
+
+def _read_header(data, path):
+    if len(data) < HEADER.size or data[:len(MAGIC)] != MAGIC:
+        raise MapParseError("not a compiled map", path)
+    fields = HEADER.unpack_from(data, 0)
+    if fields[1] != FORMAT_VERSION:
+        raise MapParseError(f"compiled map format {fields[1]} is not supported", path)
+    return fields
+
+
+def load_compiled(path):
+    """Load a compiled map as (rows, cols, marker, goals, Grid) through a read-only mmap.
+
+    The bitmap is expanded with whole-buffer integer operations. Component
+    labels, if present, are used in place as an int view of the mapping.
+    """
+    with open(path, "rb") as file:
+        data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    _, _, flags, rows, cols, marker_col, marker_row, goal_count, component_count, _, _, _ = _read_header(data, path)
+    offset = HEADER.size
+    values = struct.unpack_from(f"<{2 * goal_count}I", data, offset)
+    goals = list(zip(values[0::2], values[1::2]))
+    offset += 8 * goal_count
+    size = rows * cols
+    bitmap_size = (size + 7) // 8
+    grid = Grid(rows, cols)
+    grid.cells[:] = unpack_cells(data[offset:offset + bitmap_size], size)
+    grid.mark_changed()
+    offset += bitmap_size
+    if flags & HAS_LABELS:
+        offset += -offset % 4
+        if sys.byteorder == "little":
+            # The view keeps the mapping alive for as long as the labels are in use
+            labels = memoryview(data)[offset:offset + 4 * size].cast("i")
+        else:
+            labels = array('i', data[offset:offset + 4 * size])
+            labels.byteswap()
+        grid.set_components(labels, component_count)
+    else:
+        data.close()
+    return rows, cols, (marker_col, marker_row), goals, grid
+
+
+def cache_is_valid(input_file, compiled):
+    """True if compiled was built from the current contents of input_file.
+
+    A matching mtime and size is trusted as is; otherwise the source is hashed
+    and compared, so touching a file without changing it keeps the cache. A
+    matching hash stores the new mtime in the header, so the next check is
+    cheap again.
+    """
+    try:
+        with open(compiled, "rb") as file:
+            fields = _read_header(file.read(HEADER.size), compiled)
+        stat = os.stat(input_file)
+    except (OSError, MapParseError):
+        return False
+    mtime, size, digest = fields[9:]
+    if stat.st_size != size:
+        return False
+    if stat.st_mtime_ns == mtime:
+        return True
+    if _digest(input_file) != digest:
+        return False
+    try:
+        with open(compiled, "r+b") as file:
+            file.write(HEADER.pack(*fields[:9], stat.st_mtime_ns, size, digest))
+    except OSError:
+        pass  # A read-only cache stays valid, it is just hashed again next time
+    return True
+
+
+def load_map(input_file, use_cache=True):
+    """Load a text or compiled map, keeping a compiled cache next to text sources.
+
+    Falls back to parsing the text when the cache cannot be written.
+    """
+    if is_compiled(input_file):
+        return load_compiled(input_file)
+    if not use_cache:
+        return parse_input_file(input_file)
+    compiled = input_file + CACHE_SUFFIX
+    if not cache_is_valid(input_file, compiled):
+        try:
+            compile_map(input_file, compiled)
+        except OSError:
+            return parse_input_file(input_file)
+    return load_compiled(compiled)
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(prog="script.py compile", description="Compile a text map into the binary format.")
+    parser.add_argument("input_file")
+    parser.add_argument("output", nargs="?", help=f"compiled file (default: <input_file>{CACHE_SUFFIX})")
+    parser.add_argument("--no-labels", dest="labels", action="store_false",
+                        help="leave out the precomputed connected component labels")
+    args = parser.parse_args(argv)
+    try:
+        output = compile_map(args.input_file, args.output, args.labels)
+    except (MapParseError, OSError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    print(f"Compiled {args.input_file} -> {output} ({os.path.getsize(output)} bytes)")
@@ -0,0 +1,6 @@
+def assert_valid_path(grid, path, start, goal):
+    """path runs from start to goal in single steps over passable cells."""
+    assert path[0] == start and path[-1] == goal
+    for a, b in zip(path, path[1:]):
+        assert abs(a[0] - b[0]) + abs(a[1] - b[1]) == 1
+    assert all(grid.is_passable(cell) for cell in path)
@@ -0,0 +1,154 @@
+import hashlib
+import threading
+import weakref
+from collections import OrderedDict
+from searchstrategy import UNREACHED, convert_path_to_directions
+from wavefront import wavefront
+
+# Default memory budget for cached fields, in bytes
+DEFAULT_BUDGET = 64 * 1024 * 1024
+
+
+def map_key(grid):
+    """Digest of (rows, cols, walls) identifying a wall layout independently of the Grid object."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{grid.rows},{grid.cols};".encode())
+    digest.update(grid.cells)
+    return digest.hexdigest()
+
+
+def search_tree(grid, source):
+    """Breadth-first distances and parents from a flat source index to every cell."""
+    return wavefront(grid, [source])
+
+
+class DistanceCache:
+    """LRU cache of BFS distance and parent fields for repeated queries on static maps.
+
+    Fields are keyed by (map_key(grid), source index), so equal wall layouts
+    share entries even across parsed Grid objects, and a wall change simply
+    stops matching the old entries. Each field costs 8 bytes per cell; the
+    least recently used fields are evicted once memory_budget is exceeded.
+    Grids are undirected, so a field rooted at either end of a query answers it.
+    Threads may share one cache: the table is locked, but a missing field is
+    built outside the lock, so two racing misses just run the BFS twice.
+    """
+
+    def __init__(self, memory_budget=DEFAULT_BUDGET):
+        self.memory_budget = memory_budget
+        self.fields = OrderedDict()  # (map key, source index) -> (distance, parent)
+        self.memory = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._keys = weakref.WeakKeyDictionary()  # Grid -> (version, map key)
+        self.lock = threading.RLock()
+
+    def __len__(self):
+        return len(self.fields)
+
+    def key(self, grid):
+        """map_key(grid), rehashed only after the grid's walls change."""
+        with self.lock:
+            cached = self._keys.get(grid)
+            if cached is None or cached[0] != grid.version:
+                cached = grid.version, map_key(grid)
+                self._keys[grid] = cached
+            return cached[1]
+
+    def lookup(self, grid, source):
+        """Cached (distance, parent) field rooted at a (col, row) cell, or None."""
+        entry = (self.key(grid), grid.index(source))
+        with self.lock:
+            field = self.fields.get(entry)
+            if field is not None:
+                self.fields.move_to_end(entry)
+            return field
+
+    def field(self, grid, source):
+        """(distance, parent) field rooted at a (col, row) cell, running a BFS on a miss."""
+        with self.lock:
+            field = self.lookup(grid, source)
+            if field is not None:
+                self.hits += 1
+                return field
+            self.misses += 1
+        entry = (self.key(grid), grid.index(source))
+        field = search_tree(grid, entry[1])
+        with self.lock:
+            if entry in self.fields:
+                return self.fields[entry]  # Another thread built it meanwhile
+            self.fields[entry] = field
+            self.memory += self._field_bytes(field)
+            # Always keep the newest field, even if it alone exceeds the budget
+            while self.memory > self.memory_budget and len(self.fields) > 1:
+                _, evicted = self.fields.popitem(last=False)
+                self.memory -= self._field_bytes(evicted)
+                self.evictions += 1
+        return field
+
+    def clear(self):
+        with self.lock:
+            self.fields.clear()
+            self.memory = 0
+
+    def rooted_field(self, grid, start, goal):
+        """Return (field, root) for a field rooted at goal or start, building one at goal on a miss.
+
+        Goals are preferred as roots since many starts usually query the same goals.
+        """
+        with self.lock:
+            for root in (goal, start):
+                field = self.lookup(grid, root)
+                if field is not None:
+                    self.hits += 1
+                    return field, root
+        return self.field(grid, goal), goal
+
+    def distance(self, grid, start, goal):
+        """Shortest path length between two cells, or None if they are not connected."""
+        field, root = self.rooted_field(grid, start, goal)
+        value = field[0][grid.index(start if root == goal else goal)]
+        return value if value != UNREACHED else None
+
+    def path(self, grid, start, goal):
+        """Shortest path from start to goal as a list of cells, [] if there is none."""
+        return self._rooted_path(grid, start, goal, *self.rooted_field(grid, start, goal))
+
+    def solve(self, marker, goals, grid):
+        """Answer a single-goal query for goals[0] in the (path, node_count, directions, visited, steps) shape.
+
+        node_count is 0 when the query is answered from the cache, otherwise the
+        number of cells the new BFS reached. visited is the distance field.
+        """
+        goal = goals[0]
+        with self.lock:
+            cached = self.lookup(grid, goal) is not None or self.lookup(grid, marker) is not None
+        # Keep the field in hand, another thread may evict it from the table meanwhile
+        field, root = self.rooted_field(grid, marker, goal)
+        path = self._rooted_path(grid, marker, goal, field, root)
+        node_count = 0 if cached else len(field[0]) - field[0].count(UNREACHED)
+        return path, node_count, convert_path_to_directions(path), field[0], []
+
+    def _rooted_path(self, grid, start, goal, field, root):
+        if root == goal:
+            return self._walk(grid, field, grid.index(start), grid.index(goal))
+        path = self._walk(grid, field, grid.index(goal), grid.index(start))
+        path.reverse()
+        return path
+
+    @staticmethod
+    def _walk(grid, field, index, root):
+        # Follow parents from index up to the field's root
+        distance, parent = field
+        if distance[index] == UNREACHED:
+            return []
+        path = [grid.cell(index)]
+        while index != root:
+            index = parent[index]
+            path.append(grid.cell(index))
+        return path
+
+    @staticmethod
+    def _field_bytes(field):
+        return sum(values.itemsize * len(values) for values in field)
@@ -0,0 +1,172 @@
+from array import array
+from gridmap import as_grid
+from indexedheap import IndexedHeap
+from searchstrategy import UNREACHED, convert_path_to_directions
+
+
+class DStarLite:
+    """Incremental shortest path planner (D* Lite) that repairs its search after wall edits.
+
+    The search runs backwards from the goal, keeping for every cell its
+    distance estimate g and the one-step lookahead rhs. Wall events only
+    touch the rhs of the changed cells and their neighbours, and the replan
+    then re-expands just the cells whose distance to the goal really changed,
+    so the cost follows the size of the change rather than the map.
+    The start can also move along the path with move_to().
+
+    Distances use UNREACHED for infinity. last_expansions holds the number
+    of cells expanded by the most recent (re)plan, and node_count the total.
+    """
+
+    def __init__(self, start, goal, walls, rows, cols, observer=None):
+        self.grid = as_grid(walls, rows, cols)
+        self.start = self.grid.index(start)
+        self.goal = self.grid.index(goal)
+        self.observer = observer
+        self.g = array('i', [UNREACHED]) * self.grid.size
+        self.rhs = array('i', [UNREACHED]) * self.grid.size
+        self.open_list = IndexedHeap()  # cell index -> (k1, k2) key
+        self.km = 0
+        self.last_start = self.start
+        self.node_count = 0
+        self.last_expansions = 0
+        self.rhs[self.goal] = 0
+        self.open_list.push(self.goal, self._key(self.goal))
+        self.replan()
+
+    def _heuristic(self, index):
+        # Manhattan distance from the current start, admissible for the backward search
+        row, col = divmod(index, self.grid.cols)
+        start_row, start_col = divmod(self.start, self.grid.cols)
+        return abs(row - start_row) + abs(col - start_col)
+
+    def _key(self, index):
+        best = min(self.g[index], self.rhs[index])
+        return best + self._heuristic(index) + self.km, best
+
+    def _lookahead(self, index):
+        """rhs of a cell: one step plus the smallest g among its passable neighbours."""
+        if self.grid.cells[index]:
+            return UNREACHED
+        best = min((self.g[neighbor] for neighbor in self.grid.neighbor_indices(index)), default=UNREACHED)
+        return best + 1 if best != UNREACHED else UNREACHED
+
+    def _update_vertex(self, index):
+        queued = index in self.open_list
+        if self.g[index] != self.rhs[index]:
+            if queued:
+                self.open_list.update(index, self._key(index))
+            else:
+                self.open_list.push(index, self._key(index))
+        elif queued:
+            self.open_list.remove(index)
+
+    def replan(self):
+        """Process queued cells until the start is consistent; returns the cells expanded."""
+        g, rhs, grid = self.g, self.rhs, self.grid
+        open_list = self.open_list
+        expansions = 0
+        while open_list:
+            index, old_key = open_list.peek()
+            start_key = self._key(self.start)
+            if old_key >= start_key and rhs[self.start] == g[self.start]:
+                break
+            new_key = self._key(index)
+            if old_key < new_key:
+                # Queued under a smaller km, requeue with its current key
+                open_list.update(index, new_key)
+                continue
+            expansions += 1
+            if self.observer:
+                self.observer("visit", grid.cell(index))
+            if g[index] > rhs[index]:
+                # Overconsistent: settle g and relax the neighbours through this cell
+                g[index] = rhs[index]
+                open_list.remove(index)
+                through = g[index] + 1
+                for neighbor in grid.neighbor_indices(index):
+                    if neighbor != self.goal and through < rhs[neighbor]:
+                        rhs[neighbor] = through
+                        self._update_vertex(neighbor)
+            else:
+                # Underconsistent: forget g and recompute every cell that relied on it
+                old_through = g[index] + 1 if g[index] != UNREACHED else UNREACHED
+                g[index] = UNREACHED
+                for neighbor in grid.neighbor_indices(index) + [index]:
+                    if neighbor != self.goal and rhs[neighbor] == old_through:
+                        rhs[neighbor] = self._lookahead(neighbor)
+                    self._update_vertex(neighbor)
+        self.last_expansions = expansions
+        self.node_count += expansions
+        return expansions
+
+    def _set_walls(self, start_col, start_row, width, height, value):
+        grid = self.grid
+        first_col, last_col = max(start_col, 0), min(start_col + width, grid.cols)
+        first_row, last_row = max(start_row, 0), min(start_row + height, grid.rows)
+        changed = [row * grid.cols + col for row in range(first_row, last_row)
+                   for col in range(first_col, last_col) if grid.cells[row * grid.cols + col] != value]
+        if value:
+            grid.add_wall(start_col, start_row, width, height)
+        else:
+            grid.remove_wall(start_col, start_row, width, height)
+        # Only edges into and out of the changed cells have a new cost
+        for index in changed:
+            col, row = index % grid.cols, index // grid.cols
+            around = [index]
+            if col < grid.cols - 1:
+                around.append(index + 1)
+            if row < grid.rows - 1:
+                around.append(index + grid.cols)
+            if col > 0:
+                around.append(index - 1)
+            if row > 0:
+                around.append(index - grid.cols)
+            for cell in around:
+                if cell != self.goal:
+                    self.rhs[cell] = self._lookahead(cell)
+                self._update_vertex(cell)
+        return len(changed)
+
+    def add_wall(self, start_col, start_row, width, height):
+        """Block an (x, y, w, h) rectangle and repair the plan; returns the cells expanded."""
+        if self._set_walls(start_col, start_row, width, height, 1):
+            return self.replan()
+        return 0
+
+    def remove_wall(self, start_col, start_row, width, height):
+        """Clear an (x, y, w, h) rectangle and repair the plan; returns the cells expanded."""
+        if self._set_walls(start_col, start_row, width, height, 0):
+            return self.replan()
+        return 0
+
+    def move_to(self, cell):
+        """Move the start to cell (normally the next cell of the path) and replan."""
+        self.start = self.grid.index(cell)
+        self.km += abs(self.start % self.grid.cols - self.last_start % self.grid.cols) + \
+            abs(self.start // self.grid.cols - self.last_start // self.grid.cols)
+        self.last_start = self.start
+        return self.replan()
+
+    def path_length(self):
+        """Length of the current shortest path, or None if the goal cannot be reached."""
+        length = self.g[self.start] if self.start != self.goal else 0
+        return length if length != UNREACHED and not self.grid.cells[self.start] else None
+
+    def path(self):
+        """Current shortest path from the start to the goal as (col, row) cells, [] if there is none."""
+        if self.path_length() is None:
+            return []
+        grid, g = self.grid, self.g
+        index = self.start
+        path = [grid.cell(index)]
+        while index != self.goal:
+            # Step to the neighbour with the smallest distance, first in RIGHT, DOWN, LEFT, UP order on ties
+            index = min(grid.neighbor_indices(index), key=lambda neighbor: g[neighbor])
+            path.append(grid.cell(index))
+        return path
+
+    def solve(self):
+        """Current plan in the (path, node_count, directions, visited, steps) shape of the strategies."""
+        path = self.path()
+        return path, self.node_count, convert_path_to_directions(path), self.g, []
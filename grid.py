@@ -1,97 +1,271 @@
-def create_grid(canvas, rows, cols, markers=[], goals=[], walls=[]):
-    """Create a grid with the specified number of rows and columns."""
-    cell_size = 30  # Size of each cell in the grid
-
-    # Draw the grid
-    for row in range(rows):
-        for col in range(cols):
-            x1, y1 = col * cell_size, row * cell_size
-            x2, y2 = x1 + cell_size, y1 + cell_size
-            canvas.create_rectangle(x1, y1, x2, y2, fill="white", outline="black")
-
-    # Draw the walls
-    for (col, row) in walls:
-        x1, y1 = col * cell_size, row * cell_size
-        x2, y2 = x1 + cell_size, y1 + cell_size
-        canvas.create_rectangle(x1, y1, x2, y2, fill="grey", outline="black")
-
-    # Draw the goals
-    for (col, row) in goals:
-        x1, y1 = col * cell_size, row * cell_size
-        x2, y2 = x1 + cell_size, y1 + cell_size
-        canvas.create_rectangle(x1, y1, x2, y2, fill="green", outline="black")
-
-    # Draw the marker
-    for (col, row) in markers:
-        x1, y1 = col * cell_size, row * cell_size
-        x2, y2 = x1 + cell_size, y1 + cell_size
-        canvas.create_rectangle(x1, y1, x2, y2, fill="red", outline="black")
-
-
-def create_yellow_square(canvas, col, row, cell_size):
-    """Draw the yellow square (marker)."""
-    padding = 10  # To make the yellow square smaller than the cell
-    x1 = col * cell_size + padding / 2
-    y1 = row * cell_size + padding / 2
-    x2 = x1 + cell_size - padding
-    y2 = y1 + cell_size - padding
-    # Create yellow square and assign a tag
-    yellow_square = canvas.create_rectangle(x1, y1, x2, y2, fill="yellow", outline="black", tags="yellow_square")
-    # Bring it to the front of other canvas elements
-    canvas.tag_raise("yellow_square")
-    return yellow_square
-
-
-def move_yellow_square(canvas, yellow_square, col, row, cell_size):
-    """Move the yellow square to a new cell and force canvas update."""
-    padding = 10  # To make the yellow square smaller than the cell
-    x1 = col * cell_size + padding / 2
-    y1 = row * cell_size + padding / 2
-    x2 = x1 + cell_size - padding
-    y2 = y1 + cell_size - padding
-    # Move the yellow square
-    canvas.coords(yellow_square, x1, y1, x2, y2)
-    # Bring it to the front of other elements
-    canvas.tag_raise("yellow_square")
-    # Force a canvas update to immediately reflect changes
-    canvas.update()
-
-    
-def animate_path(canvas, yellow_square, path, cell_size=30, delay=200):
-    """Animate the yellow square along the path and stop once the goal is reached."""
-    for index, (col, row) in enumerate(path):
-        x1 = col * cell_size + 10 / 2
-        y1 = row * cell_size + 10 / 2
-        x2 = x1 + cell_size - 10
-        y2 = y1 + cell_size - 10
-        canvas.coords(yellow_square, x1, y1, x2, y2)
-        canvas.update()
-        # Stop animation when the goal is reached
-        if index == len(path) - 1:
-            break  # Exit the loop if this is the last cell in the path
-        canvas.after(delay)
-
-def highlight_final_path(canvas, path, goals, cell_size=30):
-    """Highlight the final path in light blue with a continuous red line across the center."""
-    # Fill each cell in the path with light blue, except for goal cells which remain green
-    for col, row in path:
-        x1, y1 = col * cell_size, row * cell_size
-        x2, y2 = x1 + cell_size, y1 + cell_size
-        if (col, row) in goals:
-            fill_color = "green"
+import time
+import tkinter as tk
+from gridmap import as_grid
+
+# Milliseconds between repaints, about 60 frames per second
+FRAME_INTERVAL = 16
+
+# Seconds of queued events applied per frame, so large batches never block the window
+FRAME_BUDGET = 0.008
+
+# Largest canvas side chosen by fit_cell_size, in pixels
+MAX_CANVAS = 900
+
+# Tk colour names used by the GUI, as #rrggbb so they can also be written into PPM image data
+COLORS = {
+    "white": "#ffffff",
+    "black": "#000000",
+    "grey": "#bebebe",
+    "green": "#008000",
+    "red": "#ff0000",
+    "yellow": "#ffff00",
+    "lightgray": "#d3d3d3",
+    "lightgreen": "#90ee90",
+    "lightblue": "#add8e6",
+}
+
+
+def fit_cell_size(rows, cols, largest=30):
+    """Cell size in pixels that keeps the canvas within MAX_CANVAS, at least 1."""
+    return max(1, min(largest, MAX_CANVAS // max(rows, cols)))
+
+
+class GridRenderer:
+    """Draws the grid as a single PhotoImage and recolours cells in place.
+
+    paint() and restore() only record the new colour of a cell; flush()
+    writes every cell changed since the last frame into the image, so a cell
+    repainted several times in one frame costs a single put. The canvas
+    holds three items whatever the map size: the image, the path line and
+    the yellow square. Cell borders are drawn when cells are at least 4 pixels.
+    """
+
+    def __init__(self, canvas, rows, cols, marker, goals, walls, cell_size=30):
+        self.canvas = canvas
+        self.rows = rows
+        self.cols = cols
+        self.cell_size = cell_size
+        self.border = 1 if cell_size >= 4 else 0
+        self.marker = marker
+        self.goals = set(goals)
+        self.walls = as_grid(walls, rows, cols)
+        self.dirty = {}  # (col, row) -> colour to write on the next flush
+        self.image = tk.PhotoImage(width=cols * cell_size, height=rows * cell_size)
+        self.yellow_square = None
+        self.path_line = None
+        self._animation = None  # after() job of the path walk in progress
+        self.draw()
+
+    def base_color(self, cell):
+        """Colour of a cell with no search drawn on it."""
+        if cell == self.marker:
+            return "red"
+        if cell in self.goals:
+            return "green"
+        if self.walls.cells[cell[1] * self.cols + cell[0]]:
+            return "grey"
+        return "white"
+
+    def draw(self):
+        """Draw the whole map from scratch as one PPM image."""
+        self.dirty.clear()
+        if self._animation is not None:
+            self.canvas.after_cancel(self._animation)
+            self._animation = None
+        self.canvas.delete("all")
+        self.yellow_square = self.path_line = None
+        size, border = self.cell_size, self.border
+        black = bytes.fromhex(COLORS["black"][1:])
+        pixels = {name: bytes.fromhex(value[1:]) * (size - border) + black * border
+                  for name, value in COLORS.items()}
+        border_row = black * (self.cols * size)
+        cells = self.walls.cells
+        data = [f"P6 {self.cols * size} {self.rows * size} 255\n".encode()]
+        for row in range(self.rows):
+            base = row * self.cols
+            line = b"".join(pixels["grey" if cells[base + col] else "white"] for col in range(self.cols))
+            data.append(line * (size - border) + border_row * border)
+        self.image.configure(data=b"".join(data), format="PPM")
+        # Goals and the marker are few, paint them over the walls and open cells
+        for cell in list(self.goals) + [self.marker]:
+            self.restore(cell)
+        self.flush()
+        self.canvas.create_image(0, 0, image=self.image, anchor=tk.NW)
+
+    def paint(self, cell, color):
+        self.dirty[cell] = color
+
+    def restore(self, cell):
+        self.dirty[cell] = self.base_color(cell)
+
+    def flush(self):
+        """Write the cells changed since the last flush into the image."""
+        inner = self.cell_size - self.border
+        for (col, row), color in self.dirty.items():
+            x, y = col * self.cell_size, row * self.cell_size
+            self.image.put(COLORS.get(color, color), to=(x, y, x + inner, y + inner))
+        self.dirty.clear()
+
+    def _square_box(self, cell):
+        # The yellow square is inset by a sixth of the cell on each side, at least 1 pixel wide
+        padding = self.cell_size // 6
+        x1 = cell[0] * self.cell_size + padding
+        y1 = cell[1] * self.cell_size + padding
+        return x1, y1, x1 + max(self.cell_size - 2 * padding, 1), y1 + max(self.cell_size - 2 * padding, 1)
+
+    def show_square(self, cell):
+        """Show the yellow square on cell, creating it if needed."""
+        if self.yellow_square is None:
+            self.yellow_square = self.canvas.create_rectangle(*self._square_box(cell), fill="yellow",
+                                                              outline="black", tags="yellow_square")
         else:
-            fill_color = "lightblue"
-        canvas.create_rectangle(x1, y1, x2, y2, fill=fill_color, outline="black")
+            self.canvas.coords(self.yellow_square, *self._square_box(cell))
+        self.canvas.tag_raise("yellow_square")
+
+    def hide_square(self):
+        if self.yellow_square is not None:
+            self.canvas.delete(self.yellow_square)
+            self.yellow_square = None
+
+    def draw_path(self, path):
+        """Highlight the final path in light blue (goals stay green) with a red line through its centres."""
+        for cell in path:
+            self.paint(cell, "green" if cell in self.goals else "lightblue")
+        self.flush()
+        if len(path) > 1:
+            coords = [(value + 0.5) * self.cell_size for cell in path for value in cell]
+            self.path_line = self.canvas.create_line(coords, fill="red", width=2 if self.cell_size >= 4 else 1)
+
+    def animate_path(self, path, delay=200, on_done=None):
+        """Move the yellow square along path with after(), one cell per delay milliseconds."""
+        # Long paths step faster so the walk takes at most a few seconds
+        delay = max(FRAME_INTERVAL, min(delay, 5000 // max(len(path), 1)))
+
+        def step(index):
+            self._animation = None
+            self.show_square(path[index])
+            if index + 1 < len(path):
+                self._animation = self.canvas.after(delay, step, index + 1)
+            elif on_done:
+                on_done()
+
+        if path:
+            step(0)
+        elif on_done:
+            on_done()
+
+
+class TracePlayer:
+    """Replays a recorded searchtrace.Trace on a GridRenderer with play, pause, seek and speed.
+
+    Playing applies events_per_frame events per frame through after(), never
+    for longer than FRAME_BUDGET, and flushes the renderer once per frame.
+    Seeking backwards redraws the map and re-applies the events up to the
+    new position without drawing in between. Once the last event has been
+    played the final path is drawn and walked, and on_done() is called.
+    on_progress(position) is called after every frame and seek.
+    """
+
+    def __init__(self, renderer, trace, events_per_frame=None, on_done=None, on_progress=None):
+        self.renderer = renderer
+        self.trace = trace
+        # By default the exploration of a whole map takes about 10 seconds to play
+        self.events_per_frame = events_per_frame or max(1, renderer.rows * renderer.cols // 600)
+        self.on_done = on_done
+        self.on_progress = on_progress
+        self.position = 0
+        self.playing = False
+        self.finished = False
+        self.highlighted = set()
+        self.square = None  # Cell of the yellow square, None while it is hidden
+        self._job = None
+
+    def apply(self, event, cell):
+        renderer = self.renderer
+        if event == "start":
+            self.square = cell
+        elif event == "visit":
+            # Highlight visited node in light gray and move the yellow square onto it
+            renderer.paint(cell, "lightgray")
+            self.highlighted.add(cell)
+            if self.square is not None:
+                self.square = cell
+        elif event == "generate":
+            # Highlight expanded node in light green
+            renderer.paint(cell, "lightgreen")
+            self.highlighted.add(cell)
+        elif event == "goal":
+            # Remove the yellow square once the goal is reached
+            self.square = None
+        elif event == "reset":
+            # Clear the highlighted nodes before the next search
+            for highlighted in self.highlighted:
+                renderer.restore(highlighted)
+            self.highlighted.clear()
+            self.square = None
+
+    def _flush(self):
+        self.renderer.flush()
+        if self.square is None:
+            self.renderer.hide_square()
+        else:
+            self.renderer.show_square(self.square)
+        if self.on_progress:
+            self.on_progress(self.position)
+
+    def play(self):
+        if self.position >= len(self.trace):
+            self.seek(0)
+        if not self.playing:
+            self.playing = True
+            self._tick()
+
+    def pause(self):
+        self.playing = False
+        if self._job is not None:
+            self.renderer.canvas.after_cancel(self._job)
+            self._job = None
 
-    # Collect all center points of cells in the path for a continuous red line
-    line_coords = []
-    for col, row in path:
-        center_x = (col + 0.5) * cell_size
-        center_y = (row + 0.5) * cell_size
-        line_coords.extend([center_x, center_y])
+    def toggle(self):
+        self.pause() if self.playing else self.play()
 
-    # Draw a single continuous red line along the path
-    canvas.create_line(line_coords, fill="red", width=2)
-    canvas.update()
+    def _tick(self):
+        self._job = None
+        deadline = time.perf_counter() + FRAME_BUDGET
+        trace = self.trace
+        for _ in range(self.events_per_frame):
+            if self.position >= len(trace) or time.perf_counter() > deadline:
+                break
+            self.apply(*trace[self.position])
+            self.position += 1
+        self._flush()
+        if self.position >= len(trace):
+            self.playing = False
+            self._finish()
+        elif self.playing:
+            self._job = self.renderer.canvas.after(FRAME_INTERVAL, self._tick)
 
+    def seek(self, position):
+        """Show the search as it was after the first position events."""
+        position = max(0, min(position, len(self.trace)))
+        if position < self.position or self.finished:
+            self.renderer.draw()
+            self.highlighted.clear()
+            self.square = None
+            self.position = 0
+            self.finished = False
+        trace = self.trace
+        while self.position < position:
+            self.apply(*trace[self.position])
+            self.position += 1
+        self._flush()
+        if self.position >= len(trace) and not self.playing:
+            self._finish()
 
+    def _finish(self):
+        if self.finished:
+            return
+        self.finished = True
+        path = self.trace.result[0] if self.trace.result else []
+        self.renderer.draw_path(path)  # Ensure path cells, including goals, are blue
+        self.renderer.animate_path(path, on_done=self.on_done)
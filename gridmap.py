@@ -0,0 +1,199 @@
+import re
+from array import array
+
+# Runs of passable cells within one row of Grid.cells
+_OPEN_RUN = re.compile(b"\x00+")
+
+
+class Grid:
+    """Passability map of a rows x cols grid stored as one byte per cell.
+
+    Cell (col, row) lives at index row * cols + col and a non-zero byte marks a
+    wall. A Grid can stand in for the old list of wall coordinates: the test
+    `(col, row) in grid` is O(1) and iterating yields every wall cell.
+
+    version counts wall changes. Data derived from the walls, such as the
+    connected component labels, is cached against it, so code that writes to
+    cells directly must call mark_changed() afterwards.
+    """
+
+    def __init__(self, rows, cols, walls=()):
+        self.rows = rows
+        self.cols = cols
+        self.size = rows * cols
+        self.cells = bytearray(self.size)
+        for col, row in walls:
+            if 0 <= col < cols and 0 <= row < rows:
+                self.cells[row * cols + col] = 1
+        self.version = 0
+        self._labels = None
+        self._labels_version = -1
+        self.component_count = 0
+
+    def add_wall(self, start_col, start_row, width, height):
+        """Mark an (x, y, w, h) wall rectangle as blocked, clipped to the grid."""
+        self._fill(start_col, start_row, width, height, 1)
+
+    def remove_wall(self, start_col, start_row, width, height):
+        """Clear an (x, y, w, h) wall rectangle, clipped to the grid."""
+        self._fill(start_col, start_row, width, height, 0)
+
+    def _fill(self, start_col, start_row, width, height, value):
+        first_col, last_col = max(start_col, 0), min(start_col + width, self.cols)
+        first_row, last_row = max(start_row, 0), min(start_row + height, self.rows)
+        if first_col >= last_col:
+            return
+        span = bytes([value]) * (last_col - first_col)
+        for row in range(first_row, last_row):
+            base = row * self.cols
+            self.cells[base + first_col:base + last_col] = span
+        self.mark_changed()
+
+    def mark_changed(self):
+        """Record a wall change so cached labels are rebuilt on next use."""
+        self.version += 1
+
+    def components(self):
+        """Connected component label of every cell (-1 for walls), built once per wall version."""
+        if self._labels_version != self.version:
+            self._labels, self.component_count = self._label_components()
+            self._labels_version = self.version
+        return self._labels
+
+    def set_components(self, labels, count):
+        """Install labels computed elsewhere (e.g. loaded from a compiled map) for the current walls."""
+        self._labels, self.component_count = labels, count
+        self._labels_version = self.version
+
+    def component(self, cell):
+        """Component label of a (col, row) cell, or -1 for walls and cells off the grid."""
+        if not self.in_bounds(cell):
+            return -1
+        return self.components()[cell[1] * self.cols + cell[0]]
+
+    def connected(self, a, b):
+        """True if a path of passable cells joins cells a and b."""
+        label = self.component(a)
+        return label != -1 and label == self.component(b)
+
+    def reachable_goals(self, start, goals):
+        """The goals in start's component, in their original order. O(1) per goal once labelled.
+
+        A start on a wall has no component, so its goals are returned unfiltered.
+        """
+        label = self.component(start)
+        if label == -1:
+            return list(goals)
+        return [goal for goal in goals if self.component(goal) == label]
+
+    def _label_components(self):
+        # Union-find over the horizontal runs of open cells: runs in adjacent rows join when they overlap
+        cols = self.cols
+        runs = []       # (start index, end index) of each run
+        row_runs = []   # Range of run numbers in each row
+        for row in range(self.rows):
+            base = row * cols
+            first = len(runs)
+            for match in _OPEN_RUN.finditer(self.cells, base, base + cols):
+                runs.append((match.start(), match.end()))
+            row_runs.append((first, len(runs)))
+        parent = list(range(len(runs)))
+
+        def find(run):
+            while parent[run] != run:
+                parent[run] = parent[parent[run]]
+                run = parent[run]
+            return run
+
+        for row in range(1, self.rows):
+            above, above_end = row_runs[row - 1]
+            below, below_end = row_runs[row]
+            while above < above_end and below < below_end:
+                top_start, top_end = runs[above]
+                bottom_start, bottom_end = runs[below]
+                if top_start + cols < bottom_end and bottom_start < top_end + cols:
+                    root_a, root_b = find(above), find(below)
+                    if root_a != root_b:
+                        parent[root_b] = root_a
+                # Advance whichever run ends first
+                if top_end + cols <= bottom_end:
+                    above += 1
+                else:
+                    below += 1
+
+        labels = array('i', [-1]) * self.size
+        numbers = {}
+        for run, (start, end) in enumerate(runs):
+            label = numbers.setdefault(find(run), len(numbers))
+            labels[start:end] = array('i', [label]) * (end - start)
+        return labels, len(numbers)
+
+    def index(self, cell):
+        """Flat index of a (col, row) cell."""
+        return cell[1] * self.cols + cell[0]
+
+    def cell(self, index):
+        """(col, row) cell of a flat index."""
+        row, col = divmod(index, self.cols)
+        return col, row
+
+    def in_bounds(self, cell):
+        col, row = cell
+        return 0 <= col < self.cols and 0 <= row < self.rows
+
+    def is_passable(self, cell):
+        return self.in_bounds(cell) and not self.cells[cell[1] * self.cols + cell[0]]
+
+    def neighbors(self, cell):
+        """Passable neighbours of a cell in RIGHT, DOWN, LEFT, UP order."""
+        col, row = cell
+        cells = self.cells
+        index = row * self.cols + col
+        neighbors = []
+        if col < self.cols - 1 and not cells[index + 1]:
+            neighbors.append((col + 1, row))  # RIGHT
+        if row < self.rows - 1 and not cells[index + self.cols]:
+            neighbors.append((col, row + 1))  # DOWN
+        if col > 0 and not cells[index - 1]:
+            neighbors.append((col - 1, row))  # LEFT
+        if row > 0 and not cells[index - self.cols]:
+            neighbors.append((col, row - 1))  # UP
+        return neighbors
+
+    def neighbor_indices(self, index):
+        """Flat indices of the passable neighbours of index, in the same order as neighbors()."""
+        cells = self.cells
+        cols = self.cols
+        col = index % cols
+        neighbors = []
+        if col < cols - 1 and not cells[index + 1]:
+            neighbors.append(index + 1)  # RIGHT
+        if index + cols < self.size and not cells[index + cols]:
+            neighbors.append(index + cols)  # DOWN
+        if col > 0 and not cells[index - 1]:
+            neighbors.append(index - 1)  # LEFT
+        if index >= cols and not cells[index - cols]:
+            neighbors.append(index - cols)  # UP
+        return neighbors
+
+    def __contains__(self, cell):
+        # Wall test, matching `cell in walls` on the old coordinate list
+        return self.in_bounds(cell) and self.cells[cell[1] * self.cols + cell[0]] != 0
+
+    def __iter__(self):
+        # Yield every wall cell in row-major order
+        cells = self.cells
+        index = cells.find(1)
+        while index != -1:
+            yield self.cell(index)
+            index = cells.find(1, index + 1)
+
+    def __len__(self):
+        return self.size - self.cells.count(0)
+
+
+def as_grid(walls, rows, cols):
+    """Return walls as a Grid, building one from a list of wall coordinates if needed."""
+    if isinstance(walls, Grid):
+        return walls
+    return Grid(rows, cols, walls)
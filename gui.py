@@ -1,98 +1,191 @@
 import tkinter as tk
-from grid import create_grid, create_yellow_square, animate_path, highlight_final_path
-from searchstrategy import dfs, bfs, gbfs, a_star, iddfs, ida_star
-
-def create_grid_window(rows, cols, marker, goals, walls, method, weight=None, find_multiple_paths=False, cell_size=30, input_file=None):
-    window = tk.Tk()
-    window.title("Grid Visualization")
-
-    # Canvas for grid visualization
-    grid_canvas = tk.Canvas(window, width=cols * cell_size, height=rows * cell_size, bg="white")
-    grid_canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-
-    # Text widget for displaying output information
-    output_text = tk.Text(window, height=10, width=cols * cell_size // 10, font=("Arial", 12), state=tk.DISABLED)
-    output_text.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True, padx=10, pady=10)
-
-    # Dictionary to map method abbreviations to full names
-    method_full_names = {
-        "DFS": "Depth-First Search",
-        "BFS": "Breadth-First Search",
-        "GBFS": "Greedy Best-First Search",
-        "AS": "A* Search",
-        "CUS1": "Iterative Deepening Depth-First Search",
-        "CUS2": "Iterative Deepening A* Search"
-    }
-
-    def run_search():
-        # Clear the canvas and output text
-        grid_canvas.delete("all")
-        output_text.config(state=tk.NORMAL)
-        output_text.delete("1.0", tk.END)
-    
-        # Create the initial grid with the marker, goals, and walls
-        create_grid(grid_canvas, rows, cols, markers=[marker], goals=goals, walls=walls)
-    
-        # Execute the selected search algorithm
-        if method == "DFS":
-            result = dfs(marker, goals, walls, rows, cols, grid_canvas, cell_size, find_multiple_paths)
-        elif method == "BFS":
-            result = bfs(marker, goals, walls, rows, cols, grid_canvas, cell_size, find_multiple_paths)
-        elif method == "GBFS":
-            result = gbfs(marker, goals, walls, rows, cols, grid_canvas, cell_size, find_multiple_paths)
-        elif method == "AS":
-            result = a_star(marker, goals, walls, rows, cols, grid_canvas, cell_size, find_multiple_paths)
-        elif method == "CUS1":
-            result = iddfs(marker, goals, walls, rows, cols, grid_canvas, cell_size, find_multiple_paths)
-        elif method == "CUS2":
-            result = ida_star(marker, goals, walls, rows, cols, grid_canvas, cell_size, find_multiple_paths)
-        else:
-            output_text.insert(tk.END, f"Method '{method}' not supported.\n")
-            output_text.config(state=tk.DISABLED)
+from grid import GridRenderer, TracePlayer, fit_cell_size
+from gridmap import as_grid
+from searchstrategy import STRATEGIES, format_result
+from searchworker import SearchWorker
+
+# Milliseconds between polls of the background search
+POLL_INTERVAL = 50
+
+class SearchWindow:
+    """Window that runs searches on a background thread and replays their traces.
+
+    The toolbar picks the method and starts or cancels a search. While it
+    runs the Tk main loop stays free and polls the worker for a nodes/s
+    readout; when it finishes its trace is played back with the controls at
+    the bottom. Another method can be started on the same map at any time.
+    """
+
+    def __init__(self, rows, cols, marker, goals, walls, method="BFS", find_multiple_paths=False, cell_size=None, input_file=None, trace_file=None):
+        self.rows, self.cols = rows, cols
+        self.marker, self.goals = marker, goals
+        self.walls = as_grid(walls, rows, cols)
+        self.input_file = input_file
+        self.trace_file = trace_file  # Save the next finished search's trace here
+        self.worker = SearchWorker()
+        self.player = None
+        self.running_method = None
+        self.poll_job = None
+        self.shown_position = 0  # Last position given to the slider; Tk reports it back to on_seek, maybe later
+        cell_size = cell_size or fit_cell_size(rows, cols)
+
+        self.window = tk.Tk()
+        self.window.title("Grid Visualization")
+
+        # Method selection and search controls along the top of the window
+        toolbar = tk.Frame(self.window)
+        toolbar.pack(side=tk.TOP, fill=tk.X)
+        self.method = tk.StringVar(value=method)
+        tk.OptionMenu(toolbar, self.method, *STRATEGIES).pack(side=tk.LEFT, padx=5, pady=5)
+        self.multiple = tk.BooleanVar(value=find_multiple_paths)
+        tk.Checkbutton(toolbar, text="Multiple goals", variable=self.multiple).pack(side=tk.LEFT)
+        tk.Button(toolbar, text="Run", width=6, command=self.run).pack(side=tk.LEFT, padx=5)
+        self.cancel_button = tk.Button(toolbar, text="Cancel", width=6, command=self.cancel, state=tk.DISABLED)
+        self.cancel_button.pack(side=tk.LEFT)
+        self.status = tk.Label(toolbar, anchor=tk.W)
+        self.status.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=10)
+
+        # Playback controls along the bottom of the window
+        controls = tk.Frame(self.window)
+        controls.pack(side=tk.BOTTOM, fill=tk.X)
+        self.play_button = tk.Button(controls, text="Play", width=6, command=self.toggle_playback, state=tk.DISABLED)
+        self.play_button.pack(side=tk.LEFT, padx=5, pady=5)
+        self.seek_scale = tk.Scale(controls, from_=0, to=0, orient=tk.HORIZONTAL, showvalue=False, command=self.on_seek)
+        self.seek_scale.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+        self.position_label = tk.Label(controls, width=24)
+        self.position_label.pack(side=tk.LEFT)
+        tk.Label(controls, text="Events per frame").pack(side=tk.LEFT)
+        self.speed_scale = tk.Scale(controls, from_=1, to=100, orient=tk.HORIZONTAL, command=self.on_speed)
+        self.speed_scale.pack(side=tk.LEFT, padx=5)
+
+        # Canvas for grid visualization
+        grid_canvas = tk.Canvas(self.window, width=cols * cell_size, height=rows * cell_size, bg="white")
+        grid_canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        # Text widget for displaying output information
+        self.output_text = tk.Text(self.window, height=10, width=cols * cell_size // 10, font=("Arial", 12), state=tk.DISABLED)
+        self.output_text.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True, padx=10, pady=10)
+
+        self.renderer = GridRenderer(grid_canvas, rows, cols, marker, goals, self.walls, cell_size)
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+    # Searching
+
+    def run(self):
+        """Start the selected method in the background, cancelling any search still running."""
+        self.stop_playback()
+        self.renderer.draw()
+        self.show_report([])
+        self.running_method = self.method.get()
+        self.worker.start(self.running_method, self.marker, self.goals, self.walls, self.rows, self.cols, self.multiple.get())
+        self.cancel_button.config(state=tk.NORMAL)
+        self.status.config(text=f"Searching with {self.running_method}...")
+        if self.poll_job is not None:
+            self.window.after_cancel(self.poll_job)
+        self.poll_job = self.window.after(POLL_INTERVAL, self.poll)
+
+    def cancel(self):
+        self.worker.cancel()
+
+    def poll(self):
+        """Handle the worker's messages, polling again while the search runs."""
+        self.poll_job = None
+        for kind, payload in self.worker.poll():
+            if kind == "progress":
+                nodes, elapsed = payload
+                self.status.config(text=f"Searching with {self.running_method}: {nodes} nodes, {nodes / elapsed:,.0f} nodes/s")
+            elif kind == "done":
+                result, trace, elapsed = payload
+                self.finish_search()
+                rate = result[1] / elapsed if elapsed else 0
+                self.status.config(text=f"{self.running_method}: {result[1]} nodes in {elapsed:.3f} s ({rate:,.0f} nodes/s)")
+                if self.trace_file:
+                    trace.save(self.trace_file)
+                    self.trace_file = None
+                self.show_trace(trace)
+                return
+            elif kind == "cancelled":
+                self.finish_search()
+                self.status.config(text=f"{self.running_method} cancelled.")
+                return
+            elif kind == "error":
+                self.finish_search()
+                self.status.config(text=f"{self.running_method} failed: {payload}")
+                return
+        self.poll_job = self.window.after(POLL_INTERVAL, self.poll)
+
+    def finish_search(self):
+        self.cancel_button.config(state=tk.DISABLED)
+
+    # Playback
+
+    def show_report(self, lines):
+        self.output_text.config(state=tk.NORMAL)
+        self.output_text.delete("1.0", tk.END)
+        for line in lines:
+            print(line)
+            self.output_text.insert(tk.END, line + "\n")
+        self.output_text.config(state=tk.DISABLED)
+
+    def show_trace(self, trace):
+        """Display the results of a recorded search and start playing it back."""
+        report = format_result(trace.result, trace.method, trace.goals, trace.find_multiple_paths, self.input_file)
+        self.show_report(report or ["No path found."])
+        self.player = TracePlayer(self.renderer, trace, on_done=self.show_progress, on_progress=self.show_progress)
+        self.seek_scale.config(to=len(trace))
+        self.speed_scale.config(to=max(self.player.events_per_frame * 10, 100))
+        self.speed_scale.set(self.player.events_per_frame)
+        self.play_button.config(state=tk.NORMAL)
+        self.player.play()
+
+    def stop_playback(self):
+        if self.player is not None:
+            self.player.pause()
+            self.player = None
+        self.play_button.config(state=tk.DISABLED, text="Play")
+
+    def toggle_playback(self):
+        if self.player is not None:
+            self.player.toggle()
+            self.show_progress()
+
+    def show_progress(self, position=None):
+        player = self.player
+        if player is None:
             return
-    
-        # Display results and highlight the final path
-        if result and (find_multiple_paths or goals[0] in result[0]):
-            if method == "CUS1" or method == "CUS2":
-                path, node_count, directions, visited, steps, iterations = result
-            else:
-                path, node_count, directions, visited, steps = result
-    
-            # Output for finding goals
-            print(f"Selected Map Input: {input_file}")
-            full_method_name = method_full_names.get(method, method)
-            print(f"Search Strategy: {full_method_name}")
-            if find_multiple_paths:
-                print(f"Goals Found: {', '.join(map(str, goals))}")
-            else:
-                print(f"Goal Found: {goals[0]}")
-            if method == "CUS1" or method == "CUS2":
-                print(f"Number of Iterations: {iterations}")
-            print(f"Number of Nodes Visited: {node_count}")
-            print(f"Path to Goal(s): {', '.join(directions)}")
-
-            output_text.insert(tk.END, f"Selected Map Input: {input_file}\n")
-            output_text.insert(tk.END, f"Search Strategy: {full_method_name}\n")
-            if find_multiple_paths:
-                output_text.insert(tk.END, f"Goals Found: {', '.join(map(str, goals))}\n")
-            else:
-                output_text.insert(tk.END, f"Goal Found: {goals[0]}\n")
-            if method == "CUS1" or method == "CUS2":
-                output_text.insert(tk.END, f"Number of Iterations: {iterations}\n")
-            output_text.insert(tk.END, f"Number of Nodes Visited: {node_count}\n")
-            output_text.insert(tk.END, f"Path to Goal(s): {', '.join(directions)}\n")
-
-            highlight_final_path(grid_canvas, path, goals, cell_size)  # Ensure path cells, including goals, are blue
-            yellow_square = create_yellow_square(grid_canvas, marker[0], marker[1], cell_size)
-            animate_path(grid_canvas, yellow_square, path, cell_size)
-    
-        else:
-            output_text.insert(tk.END, "No path found.\n")
-            print("No path found.")
-    
-        output_text.config(state=tk.DISABLED)
-
-    # Run the search function initially
-    run_search()
-
-    window.mainloop()
\ No newline at end of file
+        self.shown_position = player.position
+        self.seek_scale.set(player.position)
+        self.position_label.config(text=f"{player.position} / {len(player.trace)} events")
+        self.play_button.config(text="Pause" if player.playing else "Play")
+
+    def on_seek(self, value):
+        position = int(float(value))
+        if self.player is not None and position != self.shown_position:
+            self.shown_position = position
+            self.player.seek(position)
+
+    def on_speed(self, value):
+        if self.player is not None:
+            self.player.events_per_frame = int(float(value))
+
+    def close(self):
+        self.worker.cancel()
+        self.window.destroy()
+
+    def mainloop(self):
+        self.window.mainloop()
+
+def create_grid_window(rows, cols, marker, goals, walls, method, weight=None, find_multiple_paths=False, cell_size=None, input_file=None, trace_file=None):
+    """Open the window and run method on the map in the background.
+
+    trace_file also saves the recorded trace for a later replay_trace_window().
+    """
+    window = SearchWindow(rows, cols, marker, goals, walls, method, find_multiple_paths, cell_size, input_file, trace_file)
+    window.run()
+    window.mainloop()
+
+def replay_trace_window(trace, cell_size=None, input_file=None):
+    """Open a window playing a recorded searchtrace.Trace; other methods can then be run on its map."""
+    window = SearchWindow(trace.rows, trace.cols, trace.marker, trace.goals, trace.grid, trace.method, trace.find_multiple_paths, cell_size, input_file)
+    window.show_trace(trace)
+    window.mainloop()
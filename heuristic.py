@@ -0,0 +1,178 @@
+import heapq
+from array import array
+# UNREACHABLE is the heuristic value of cells that cannot reach any goal
+from wavefront import UNREACHED as UNREACHABLE, wavefront
+
+try:
+    import numpy
+except ImportError:  # NumPy is optional; the pure Python tables give the same values
+    numpy = None
+
+HEURISTIC_MODES = ("manhattan", "distance")
+
+
+class HeuristicField:
+    """Per-cell lower bound on the distance to the nearest remaining goal.
+
+    The table is built once for a goal set and read with `field[index]` (or
+    field.values[index]) using flat cell indices, so a search pays one array
+    read per generated node instead of a min() over every goal.
+
+    mode "manhattan" gives the Manhattan distance to the nearest goal, ignoring
+    walls. mode "distance" gives the true shortest path length from a reverse
+    multi-source BFS, and UNREACHABLE for cells walled off from every goal.
+    Each cell also remembers which goal it is closest to, so remove_goal()
+    only recomputes the cells that goal owned.
+    """
+
+    def __init__(self, grid, goals, mode="manhattan"):
+        if mode not in HEURISTIC_MODES:
+            raise ValueError(f"Unknown heuristic mode '{mode}'. Choose from {', '.join(HEURISTIC_MODES)}.")
+        self.grid = grid
+        self.mode = mode
+        self.goals = [goal for goal in dict.fromkeys(goals) if grid.in_bounds(goal)]
+        self.active = [True] * len(self.goals)
+        if mode == "manhattan":
+            self.values, self.owner = self._build_manhattan()
+        else:
+            self.values, self.owner = self._build_distance()
+
+    def __getitem__(self, index):
+        return self.values[index]
+
+    def cell_value(self, cell):
+        return self.values[self.grid.index(cell)]
+
+    def remove_goal(self, goal):
+        """Drop a reached goal and update only the cells for which it was the nearest."""
+        try:
+            number = self.goals.index(goal)
+        except ValueError:
+            return
+        if not self.active[number]:
+            return
+        self.active[number] = False
+        owned = self._owned_cells(number)
+        if self.mode == "manhattan":
+            self._update_manhattan(owned)
+        else:
+            self._update_distance(owned)
+
+    def _owned_cells(self, number):
+        """Flat indices of the cells whose nearest goal is goal number."""
+        if numpy is not None:
+            return numpy.flatnonzero(numpy.frombuffer(self.owner, dtype=numpy.int32) == number)
+        owner = self.owner
+        return [index for index in range(self.grid.size) if owner[index] == number]
+
+    # Manhattan lower bound
+
+    def _build_manhattan(self):
+        size = self.grid.size
+        if not self.goals:
+            return array('i', [UNREACHABLE]) * size, array('i', [-1]) * size
+        if numpy is not None:
+            values, owner = self._numpy_manhattan(numpy.arange(size), range(len(self.goals)))
+            return array('i', values.astype(numpy.int32).tobytes()), array('i', owner.astype(numpy.int32).tobytes())
+        return self._distance_transform()
+
+    def _numpy_manhattan(self, indices, goal_numbers):
+        """Vectorised minimum Manhattan distance and owning goal for the given flat indices."""
+        cols_of = indices % self.grid.cols
+        rows_of = indices // self.grid.cols
+        values = numpy.full(len(indices), UNREACHABLE, dtype=numpy.int64)
+        owner = numpy.full(len(indices), -1, dtype=numpy.int64)
+        for number in goal_numbers:
+            goal_col, goal_row = self.goals[number]
+            distance = numpy.abs(cols_of - goal_col) + numpy.abs(rows_of - goal_row)
+            closer = distance < values
+            values[closer] = distance[closer]
+            owner[closer] = number
+        return values, owner
+
+    def _distance_transform(self):
+        """Two-pass L1 distance transform; exact Manhattan minimum over all goals in O(cells)."""
+        rows, cols = self.grid.rows, self.grid.cols
+        values = array('i', [UNREACHABLE]) * self.grid.size
+        owner = array('i', [-1]) * self.grid.size
+        for number, goal in enumerate(self.goals):
+            index = self.grid.index(goal)
+            if values[index] != 0:
+                values[index] = 0
+                owner[index] = number
+        # Forward pass pulls distances from the left and above, backward pass from the right and below
+        for index in range(self.grid.size):
+            if index % cols and values[index - 1] + 1 < values[index]:
+                values[index] = values[index - 1] + 1
+                owner[index] = owner[index - 1]
+            if index >= cols and values[index - cols] + 1 < values[index]:
+                values[index] = values[index - cols] + 1
+                owner[index] = owner[index - cols]
+        for index in range(self.grid.size - 1, -1, -1):
+            if index % cols != cols - 1 and values[index + 1] + 1 < values[index]:
+                values[index] = values[index + 1] + 1
+                owner[index] = owner[index + 1]
+            if index < (rows - 1) * cols and values[index + cols] + 1 < values[index]:
+                values[index] = values[index + cols] + 1
+                owner[index] = owner[index + cols]
+        return values, owner
+
+    def _update_manhattan(self, owned):
+        remaining = [number for number, active in enumerate(self.active) if active]
+        if numpy is not None:
+            owned = numpy.asarray(owned, dtype=numpy.int64)
+            values, owner = self._numpy_manhattan(owned, remaining)
+            # Write through views of the int arrays so lookups keep using the same objects
+            numpy.frombuffer(self.values, dtype=numpy.int32)[owned] = values
+            numpy.frombuffer(self.owner, dtype=numpy.int32)[owned] = owner
+            return
+        cols = self.grid.cols
+        for index in owned:
+            row, col = divmod(index, cols)
+            best, best_number = UNREACHABLE, -1
+            for number in remaining:
+                goal_col, goal_row = self.goals[number]
+                distance = abs(col - goal_col) + abs(row - goal_row)
+                if distance < best:
+                    best, best_number = distance, number
+            self.values[index] = best
+            self.owner[index] = best_number
+
+    # True distance through passable cells
+
+    def _build_distance(self):
+        # Multi-source wavefront from every goal, see wavefront.wavefront
+        sources = [self.grid.index(goal) for goal in self.goals]
+        values, _, owner = wavefront(self.grid, sources, with_owner=True)
+        return values, owner
+
+    def _update_distance(self, owned):
+        # Reset the removed goal's region, then grow the neighbouring regions back into it
+        grid = self.grid
+        values, owner = self.values, self.owner
+        owned = [int(index) for index in owned]
+        for index in owned:
+            values[index] = UNREACHABLE
+            owner[index] = -1
+        frontier = []
+        for index in owned:
+            for neighbor in grid.neighbor_indices(index):
+                if owner[neighbor] != -1:
+                    frontier.append((values[neighbor], neighbor))
+        heapq.heapify(frontier)
+        while frontier:
+            value, index = heapq.heappop(frontier)
+            if value > values[index]:
+                continue
+            for neighbor in grid.neighbor_indices(index):
+                if value + 1 < values[neighbor]:
+                    values[neighbor] = value + 1
+                    owner[neighbor] = owner[index]
+                    heapq.heappush(frontier, (value + 1, neighbor))
+
+
+def heuristic_field(heuristic, grid, goals):
+    """Return heuristic as a HeuristicField, building one if it names a mode."""
+    if isinstance(heuristic, HeuristicField):
+        return heuristic
+    return HeuristicField(grid, goals, heuristic)
@@ -0,0 +1,293 @@
+import heapq
+from gridmap import Grid
+from searchstrategy import UNREACHED, a_star, convert_path_to_directions
+from wavefront import distance_field
+
+# Default side length of a square cluster, in cells
+CLUSTER_SIZE = 16
+
+# Open border runs at least this long get an entrance at each end instead of one in the middle
+LONG_ENTRANCE = 6
+
+
+class HierarchicalMap:
+    """HPA* abstraction of a Grid for fast repeated queries on large maps.
+
+    The map is cut into cluster_size x cluster_size clusters. Every open run
+    along a border between two clusters contributes entrances: a pair of
+    facing cells joined by an edge of cost 1. Inside each cluster the BFS
+    distance between every two of its entrance cells is precomputed, so a query
+    is an A* over this small graph followed by refining each abstract edge with
+    a_star on the cluster's own sub-grid. Refined segments are cached, so
+    repeated queries mostly reduce to the abstract search. Paths are near
+    optimal: they may be a few steps longer than the true shortest path.
+
+    Change walls through add_wall()/remove_wall() to rebuild only the clusters
+    they touch. Any other change to the grid rebuilds everything on the next query.
+    """
+
+    def __init__(self, grid, cluster_size=CLUSTER_SIZE):
+        self.grid = grid
+        self.cluster_size = cluster_size
+        self.cluster_cols = -(-grid.cols // cluster_size)
+        self.cluster_rows = -(-grid.rows // cluster_size)
+        self.build()
+
+    # Construction
+
+    def build(self):
+        """(Re)build the whole abstraction."""
+        self.local = {}      # cluster -> Grid copy of its cells
+        self.borders = {}    # (cluster, neighbouring cluster) -> [(cell index, facing cell index)]
+        self.inter = {}      # entrance cell index -> set of facing entrance cell indices
+        self.intra = {}      # cluster -> {entrance index: {entrance index: distance}}
+        self.segments = {}   # cluster -> {(from index, to index): refined cells}
+        clusters = [(cx, cy) for cy in range(self.cluster_rows) for cx in range(self.cluster_cols)]
+        for cluster in clusters:
+            self._build_local(cluster)
+        for cluster in clusters:
+            for neighbour in self._forward_neighbours(cluster):
+                self._build_border(cluster, neighbour)
+        for cluster in clusters:
+            self._build_cluster(cluster)
+        self.version = self.grid.version
+
+    def cluster_of(self, index):
+        row, col = divmod(index, self.grid.cols)
+        return col // self.cluster_size, row // self.cluster_size
+
+    def _bounds(self, cluster):
+        # (first col, first row, last col + 1, last row + 1) of a cluster
+        cx, cy = cluster
+        size = self.cluster_size
+        return (cx * size, cy * size,
+                min((cx + 1) * size, self.grid.cols), min((cy + 1) * size, self.grid.rows))
+
+    def _forward_neighbours(self, cluster):
+        # Right and lower neighbours, so each border is visited once
+        cx, cy = cluster
+        if cx + 1 < self.cluster_cols:
+            yield cx + 1, cy
+        if cy + 1 < self.cluster_rows:
+            yield cx, cy + 1
+
+    def _neighbours(self, cluster):
+        cx, cy = cluster
+        for other in ((cx + 1, cy), (cx, cy + 1), (cx - 1, cy), (cx, cy - 1)):
+            if 0 <= other[0] < self.cluster_cols and 0 <= other[1] < self.cluster_rows:
+                yield other
+
+    def _build_local(self, cluster):
+        first_col, first_row, end_col, end_row = self._bounds(cluster)
+        width = end_col - first_col
+        local = Grid(end_row - first_row, width)
+        cols = self.grid.cols
+        for row in range(first_row, end_row):
+            start = row * cols + first_col
+            local.cells[(row - first_row) * width:(row - first_row + 1) * width] = self.grid.cells[start:start + width]
+        local.mark_changed()
+        self.local[cluster] = local
+        self.segments[cluster] = {}
+
+    def _build_border(self, cluster, neighbour):
+        """Find the entrances on the border between cluster and its right or lower neighbour."""
+        for index, facing in self.borders.pop((cluster, neighbour), ()):
+            for a, b in ((index, facing), (facing, index)):
+                links = self.inter[a]
+                links.discard(b)
+                if not links:
+                    del self.inter[a]
+        first_col, first_row, end_col, end_row = self._bounds(cluster)
+        cols, cells = self.grid.cols, self.grid.cells
+        if neighbour[0] != cluster[0]:
+            # Vertical border: cells in the cluster's last column face the next column
+            pairs = [(row * cols + end_col - 1, row * cols + end_col) for row in range(first_row, end_row)]
+        else:
+            pairs = [(end_row * cols - cols + col, end_row * cols + col) for col in range(first_col, end_col)]
+
+        entrances = []
+        run = []
+        for pair in pairs + [None]:
+            if pair is not None and not cells[pair[0]] and not cells[pair[1]]:
+                run.append(pair)
+                continue
+            if len(run) >= LONG_ENTRANCE:
+                entrances.extend((run[0], run[-1]))
+            elif run:
+                entrances.append(run[len(run) // 2])
+            run = []
+        self.borders[(cluster, neighbour)] = entrances
+        for index, facing in entrances:
+            self.inter.setdefault(index, set()).add(facing)
+            self.inter.setdefault(facing, set()).add(index)
+
+    def _entrances(self, cluster):
+        """Entrance cells lying inside cluster."""
+        nodes = set()
+        for neighbour in self._neighbours(cluster):
+            if (cluster, neighbour) in self.borders:
+                nodes.update(index for index, _ in self.borders[(cluster, neighbour)])
+            else:
+                nodes.update(facing for _, facing in self.borders.get((neighbour, cluster), ()))
+        return nodes
+
+    def _build_cluster(self, cluster):
+        """Distances between every two entrances of a cluster, through the cluster only."""
+        local = self.local[cluster]
+        nodes = sorted(self._entrances(cluster))
+        local_indices = [self._to_local(cluster, index) for index in nodes]
+        table = {}
+        for index, source in zip(nodes, local_indices):
+            distance = distance_field(local, source)
+            table[index] = {other: distance[target] for other, target in zip(nodes, local_indices)
+                            if other != index and distance[target] != UNREACHED}
+        self.intra[cluster] = table
+        self.segments[cluster] = {}
+
+    def _to_local(self, cluster, index):
+        first_col, first_row, end_col, _ = self._bounds(cluster)
+        row, col = divmod(index, self.grid.cols)
+        return (row - first_row) * (end_col - first_col) + col - first_col
+
+    def _to_global(self, cluster, local_index):
+        first_col, first_row, end_col, _ = self._bounds(cluster)
+        row, col = divmod(local_index, end_col - first_col)
+        return (row + first_row) * self.grid.cols + col + first_col
+
+    # Wall changes
+
+    def add_wall(self, start_col, start_row, width, height):
+        """Add an (x, y, w, h) wall to the grid and rebuild the clusters it touches."""
+        self.grid.add_wall(start_col, start_row, width, height)
+        self._rebuild_area(start_col, start_row, width, height)
+
+    def remove_wall(self, start_col, start_row, width, height):
+        """Remove an (x, y, w, h) wall from the grid and rebuild the clusters it touches."""
+        self.grid.remove_wall(start_col, start_row, width, height)
+        self._rebuild_area(start_col, start_row, width, height)
+
+    def _rebuild_area(self, start_col, start_row, width, height):
+        size = self.cluster_size
+        first_col, last_col = max(start_col, 0), min(start_col + width, self.grid.cols) - 1
+        first_row, last_row = max(start_row, 0), min(start_row + height, self.grid.rows) - 1
+        if first_col > last_col or first_row > last_row:
+            self.version = self.grid.version
+            return
+        changed = {(cx, cy) for cy in range(first_row // size, last_row // size + 1)
+                   for cx in range(first_col // size, last_col // size + 1)}
+        for cluster in changed:
+            self._build_local(cluster)
+        # Borders of a changed cluster may gain or lose entrances, which its neighbours share
+        affected = set(changed)
+        for cluster in changed:
+            for neighbour in self._neighbours(cluster):
+                affected.add(neighbour)
+                pair = (cluster, neighbour) if neighbour in set(self._forward_neighbours(cluster)) \
+                    else (neighbour, cluster)
+                self._build_border(*pair)
+        for cluster in affected:
+            self._build_cluster(cluster)
+        self.version = self.grid.version
+
+    # Queries
+
+    def _links(self, index):
+        """Distances from a cell to the entrances of its own cluster, and that cluster's distance field."""
+        cluster = self.cluster_of(index)
+        distance = distance_field(self.local[cluster], self._to_local(cluster, index))
+        links = {}
+        for node in self.intra[cluster]:
+            value = distance[self._to_local(cluster, node)]
+            if value != UNREACHED and node != index:
+                links[node] = value
+        return cluster, links, distance
+
+    def abstract_path(self, start, goal):
+        """Abstract A* from start to goal (flat indices); returns (node list, expansions)."""
+        start_cluster, start_links, start_distance = self._links(start)
+        goal_cluster, goal_links, _ = self._links(goal)
+        cols = self.grid.cols
+        goal_row, goal_col = divmod(goal, cols)
+
+        def estimate(index):
+            row, col = divmod(index, cols)
+            return abs(row - goal_row) + abs(col - goal_col)
+
+        g_score = {start: 0}
+        came_from = {start: None}
+        open_list = [(estimate(start), 0, start)]
+        closed = set()
+        expansions = 0
+        while open_list:
+            _, g, index = heapq.heappop(open_list)
+            if index in closed:
+                continue
+            if index == goal:
+                nodes = []
+                while index is not None:
+                    nodes.append(index)
+                    index = came_from[index]
+                nodes.reverse()
+                return nodes, expansions
+            closed.add(index)
+            expansions += 1
+
+            if index == start:
+                edges = list(start_links.items())
+                edges.extend((facing, 1) for facing in self.inter.get(index, ()))
+                if start_cluster == goal_cluster:
+                    direct = start_distance[self._to_local(start_cluster, goal)]
+                    if direct != UNREACHED:
+                        edges.append((goal, direct))
+            else:
+                cluster = self.cluster_of(index)
+                edges = list(self.intra[cluster].get(index, {}).items())
+                edges.extend((facing, 1) for facing in self.inter.get(index, ()))
+                if index in goal_links:
+                    edges.append((goal, goal_links[index]))
+            for neighbour, cost in edges:
+                tentative = g + cost
+                if tentative < g_score.get(neighbour, UNREACHED):
+                    g_score[neighbour] = tentative
+                    came_from[neighbour] = index
+                    heapq.heappush(open_list, (tentative + estimate(neighbour), tentative, neighbour))
+        return [], expansions
+
+    def _refine(self, a, b):
+        """Cells from a to b: a single step across a border, or a_star inside their shared cluster."""
+        cluster = self.cluster_of(a)
+        if cluster != self.cluster_of(b):
+            return [self.grid.cell(a), self.grid.cell(b)], 0
+        cached = self.segments[cluster].get((a, b))
+        if cached is not None:
+            return cached, 0
+        local = self.local[cluster]
+        result = a_star(local.cell(self._to_local(cluster, a)), [local.cell(self._to_local(cluster, b))],
+                        local, local.rows, local.cols)
+        cells = [self.grid.cell(self._to_global(cluster, local.index(cell))) for cell in result[0]]
+        self.segments[cluster][(a, b)] = cells
+        return cells, result[1]
+
+    def path(self, start, goal):
+        """Near-shortest path between two (col, row) cells and the number of nodes expanded."""
+        grid = self.grid
+        if grid.version != self.version:
+            self.build()
+        # No global connectivity check: relabelling the whole map after every local
+        # edit would cost more than the query, and abstract_path finds no route anyway
+        if not (grid.is_passable(start) and grid.is_passable(goal)):
+            return [], 0
+        nodes, node_count = self.abstract_path(grid.index(start), grid.index(goal))
+        if not nodes:
+            return [], node_count
+        full_path = [start]
+        for a, b in zip(nodes, nodes[1:]):
+            segment, expanded = self._refine(a, b)
+            full_path.extend(segment[1:])
+            node_count += expanded
+        return full_path, node_count
+
+    def solve(self, marker, goals):
+        """Single-goal query for goals[0] in the (path, node_count, directions, visited, steps) shape."""
+        path, node_count = self.path(marker, goals[0])
+        return path, node_count, convert_path_to_directions(path), None, []
@@ -0,0 +1,98 @@
+import heapq
+from itertools import count
+
+# Placeholder left in a heap entry whose item has been re-prioritised or removed
+_REMOVED = object()
+
+
+class IndexedHeap:
+    """Min-priority queue of distinct items with decrease-key and O(1) membership.
+
+    Each item (any hashable, typically a flat cell index) is queued at most once.
+    An item -> entry table answers `item in heap` and priority lookups in O(1).
+    Changing a priority invalidates the old heap entry in place and pushes a new
+    one, so every operation stays O(log n) on top of the C heapq routines.
+    Invalidated entries are dropped as they surface, and the heap is compacted
+    whenever a removal leaves more of them than live entries.
+    """
+
+    def __init__(self):
+        self.heap = []       # [priority, sequence, item] entries in heapq order
+        self.entries = {}    # item -> its live heap entry
+        self.sequence = count()  # Tie-breaker so equal priorities pop in insertion order
+        self.stale = 0       # Invalidated entries still in self.heap
+        self.max_size = 0    # Largest physical heap size seen
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __bool__(self):
+        return bool(self.entries)
+
+    def __contains__(self, item):
+        return item in self.entries
+
+    def priority(self, item):
+        """Current priority of a queued item."""
+        return self.entries[item][0]
+
+    def peek(self):
+        """Return (item, priority) of the smallest entry without removing it."""
+        heap = self.heap
+        while heap[0][2] is _REMOVED:
+            heapq.heappop(heap)
+            self.stale -= 1
+        priority, _, item = heap[0]
+        return item, priority
+
+    def push(self, item, priority):
+        """Queue a new item. Use update() if the item may already be queued."""
+        if item in self.entries:
+            raise KeyError(f"{item!r} is already in the heap")
+        entry = [priority, next(self.sequence), item]
+        self.entries[item] = entry
+        heapq.heappush(self.heap, entry)
+        if len(self.heap) > self.max_size:
+            self.max_size = len(self.heap)
+
+    def decrease_key(self, item, priority):
+        """Lower the priority of a queued item."""
+        if priority > self.entries[item][0]:
+            raise ValueError("decrease_key() cannot raise a priority")
+        self.update(item, priority)
+
+    def update(self, item, priority):
+        """Push item, or move it to its new priority if it is already queued."""
+        if item in self.entries:
+            self.remove(item)
+        self.push(item, priority)
+
+    def pop(self):
+        """Remove and return (item, priority) of the smallest entry."""
+        heap = self.heap
+        while heap:
+            priority, _, item = heapq.heappop(heap)
+            if item is not _REMOVED:
+                del self.entries[item]
+                return item, priority
+            self.stale -= 1
+        raise IndexError("pop from an empty heap")
+
+    def remove(self, item):
+        """Remove a queued item and return its priority."""
+        entry = self.entries.pop(item)
+        entry[2] = _REMOVED
+        self.stale += 1
+        if self.stale > len(self.entries):
+            self._compact()
+        return entry[0]
+
+    def clear(self):
+        self.heap.clear()
+        self.entries.clear()
+        self.stale = 0
+
+    def _compact(self):
+        self.heap = [entry for entry in self.heap if entry[2] is not _REMOVED]
+        heapq.heapify(self.heap)
+        self.stale = 0
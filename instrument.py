@@ -0,0 +1,243 @@
+import argparse
+import cProfile
+import contextlib
+import functools
+import json
+import sys
+import time
+import tracemalloc
+from indexedheap import IndexedHeap
+from mapparser import MapParseError, parse_input_file
+from searchstrategy import HEAP_METHODS, STRATEGIES
+from tour import solve_tour
+
+
+class Stats:
+    """Search counters collected through the observer protocol of searchstrategy.
+
+    A Stats object is an observer: pass it as observer= to any strategy (or
+    wrap another observer with Stats(observer)) and it counts, per run:
+      expanded     "visit" events
+      generated    "generate" events
+      re_expanded  cells expanded again while searching for the same goal
+      max_frontier largest number of generated cells not yet expanded
+    Heap pushes, pops and key updates are counted by run() for the strategies
+    in HEAP_METHODS. Wall time is split into phases: "setup" up to the
+    first "start", "search" while a search is running and "finish" after it.
+    Without a Stats attached the strategies pay nothing for any of this.
+    """
+
+    def __init__(self, observer=None, clock=time.perf_counter):
+        self.observer = observer
+        self.clock = clock
+        self.expanded = 0
+        self.generated = 0
+        self.re_expanded = 0
+        self.max_frontier = 0
+        self.goals = 0
+        self.restarts = 0
+        self.heap_pushes = 0
+        self.heap_pops = 0
+        self.heap_updates = 0
+        self.peak_memory = None
+        self.phases = []     # (name, start, end) in clock seconds, in order
+        self._seen = set()   # Cells expanded since the last "start"
+        self._frontier = set()
+        self._phase = None   # (name, start) of the open phase
+        self.begin()
+
+    def __call__(self, event, cell):
+        if event == "visit":
+            self.expanded += 1
+            if cell in self._seen:
+                self.re_expanded += 1
+            else:
+                self._seen.add(cell)
+            self._frontier.discard(cell)
+            self._enter("search")
+        elif event == "generate":
+            self.generated += 1
+            self._frontier.add(cell)
+            if len(self._frontier) > self.max_frontier:
+                self.max_frontier = len(self._frontier)
+        elif event == "start":
+            self.restarts += 1
+            self._seen.clear()
+            self._frontier = {cell}
+            self._enter("search")
+        elif event == "goal":
+            self.goals += 1
+        elif event == "reset":
+            self._frontier.clear()
+        if self.observer:
+            self.observer(event, cell)
+
+    # Phases
+
+    def begin(self, name="setup"):
+        """Close the open phase and start timing name."""
+        now = self.clock()
+        if self._phase is not None:
+            self.phases.append((self._phase[0], self._phase[1], now))
+        self._phase = name, now
+
+    def _enter(self, name):
+        if self._phase[0] != name:
+            self.begin(name)
+
+    def end(self):
+        """Close the open phase, if any."""
+        if self._phase is not None:
+            self.phases.append((self._phase[0], self._phase[1], self.clock()))
+            self._phase = None
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """Time a block as its own phase, returning to the previous one afterwards."""
+        previous = self._phase[0] if self._phase is not None else None
+        self.begin(name)
+        try:
+            yield self
+        finally:
+            if previous is None:
+                self.end()
+            else:
+                self.begin(previous)
+
+    def phase_times(self):
+        """Total seconds per phase name."""
+        totals = {}
+        for name, start, end in self.phases:
+            totals[name] = totals.get(name, 0.0) + end - start
+        return totals
+
+    # Export
+
+    def as_dict(self):
+        return {
+            "expanded": self.expanded,
+            "generated": self.generated,
+            "re_expanded": self.re_expanded,
+            "max_frontier": self.max_frontier,
+            "goals": self.goals,
+            "restarts": self.restarts,
+            "heap_pushes": self.heap_pushes,
+            "heap_pops": self.heap_pops,
+            "heap_updates": self.heap_updates,
+            "peak_memory": self.peak_memory,
+            "phase_times": {name: round(seconds, 6) for name, seconds in self.phase_times().items()},
+        }
+
+    def to_json(self, path=None):
+        """The counters as JSON text, also written to path if given."""
+        text = json.dumps(self.as_dict(), indent=2)
+        if path:
+            with open(path, "w") as file:
+                file.write(text + "\n")
+        return text
+
+    def trace_events(self, name="search"):
+        """Phases as Chrome trace events, viewable in chrome://tracing, Perfetto or speedscope."""
+        if not self.phases:
+            return {"traceEvents": []}
+        origin = self.phases[0][1]
+        events = [{"name": phase, "cat": name, "ph": "X", "pid": 0, "tid": 0,
+                   "ts": round((start - origin) * 1e6, 3), "dur": round((end - start) * 1e6, 3)}
+                  for phase, start, end in self.phases]
+        events.append({"name": name, "cat": name, "ph": "C", "pid": 0, "tid": 0,
+                       "ts": events[-1]["ts"] + events[-1]["dur"],
+                       "args": {"expanded": self.expanded, "generated": self.generated}})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_trace(self, path, name="search"):
+        with open(path, "w") as file:
+            json.dump(self.trace_events(name), file)
+
+
+class CountingHeap(IndexedHeap):
+    """IndexedHeap reporting its operations to a Stats."""
+
+    def __init__(self, stats):
+        super().__init__()
+        self.stats = stats
+
+    def push(self, item, priority):
+        self.stats.heap_pushes += 1
+        super().push(item, priority)
+
+    def pop(self):
+        self.stats.heap_pops += 1
+        return super().pop()
+
+    def update(self, item, priority):
+        if item in self.entries:
+            self.stats.heap_updates += 1
+        super().update(item, priority)
+
+
+def run(method, marker, goals, walls, rows, cols, find_multiple_paths=False, observer=None,
+        memory=False, profile_path=None):
+    """Run a strategy with a Stats attached and return (result, stats).
+
+    memory traces the peak allocation with tracemalloc, and profile_path writes
+    cProfile data of the run (load it with pstats, snakeviz or gprof2dot).
+    Both slow the search down, so leave them off when timing phases.
+    Multiple goals are visited in planned tour order through tour.solve_tour,
+    as every other front end does.
+    """
+    try:
+        strategy = STRATEGIES[method]
+    except KeyError:
+        raise ValueError(f"Method '{method}' not supported.") from None
+    stats = Stats(observer)
+    profiler = cProfile.Profile() if profile_path else None
+    # The counting heap is handed to this call only, other searches keep the plain IndexedHeap
+    options = {"heap": functools.partial(CountingHeap, stats)} if method in HEAP_METHODS else {}
+    if memory:
+        tracemalloc.start()
+    try:
+        if profiler:
+            profiler.enable()
+        if find_multiple_paths:
+            result = solve_tour(method, marker, goals, walls, rows, cols, stats, **options)
+        else:
+            result = strategy(marker, goals, walls, rows, cols, False, stats, **options)
+        if profiler:
+            profiler.disable()
+        stats.begin("finish")
+        stats.end()
+        if memory:
+            stats.peak_memory = tracemalloc.get_traced_memory()[1]
+    finally:
+        if memory:
+            tracemalloc.stop()
+    if profiler:
+        profiler.dump_stats(profile_path)
+    return result, stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run one search with instrumentation and report its counters.")
+    parser.add_argument("input_file")
+    parser.add_argument("method", type=str.upper, choices=sorted(STRATEGIES))
+    parser.add_argument("--multiple", action="store_true", help="search for every goal")
+    parser.add_argument("--memory", action="store_true", help="trace peak memory with tracemalloc")
+    parser.add_argument("--json", metavar="PATH", help="write the counters as JSON")
+    parser.add_argument("--trace", metavar="PATH", help="write the phases as a Chrome trace")
+    parser.add_argument("--profile", metavar="PATH", help="write cProfile data of the search")
+    args = parser.parse_args(argv)
+
+    try:
+        rows, cols, marker, goals, walls = parse_input_file(args.input_file)
+    except (MapParseError, OSError) as e:
+        print(f"Error: Unable to parse the map. {e}")
+        sys.exit(1)
+    _, stats = run(args.method, marker, goals, walls, rows, cols, args.multiple,
+                   memory=args.memory, profile_path=args.profile)
+    print(stats.to_json(args.json))
+    if args.trace:
+        stats.write_trace(args.trace, args.method)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+import argparse
+import random
+from gridmap import Grid
+
+FAMILIES = ("open", "random", "maze", "corridor")
+
+
+class MapSpec:
+    """A generated map: dimensions, marker, goals and (x, y, w, h) wall rectangles."""
+
+    def __init__(self, rows, cols, marker, goals, walls):
+        self.rows = rows
+        self.cols = cols
+        self.marker = marker
+        self.goals = goals
+        self.walls = walls
+
+    def grid(self):
+        """Build the Grid for this map without going through the text format."""
+        grid = Grid(self.rows, self.cols)
+        for start_col, start_row, width, height in self.walls:
+            grid.add_wall(start_col, start_row, width, height)
+        return grid
+
+    def to_text(self):
+        """Render the map in the input file format read by parse_input_file."""
+        lines = [f"[{self.rows},{self.cols}]",
+                 f"({self.marker[0]},{self.marker[1]})",
+                 " | ".join(f"({col},{row})" for col, row in self.goals)]
+        lines.extend(f"({x},{y},{w},{h})" for x, y, w, h in self.walls)
+        return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        with open(path, "w") as file:
+            file.write(self.to_text())
+
+
+def open_field(rows, cols, seed=0):
+    """No walls; marker and goal in opposite corners."""
+    return MapSpec(rows, cols, (0, 0), [(cols - 1, rows - 1)], [])
+
+
+def random_obstacles(rows, cols, seed=0, density=0.2):
+    """Random 1x1 to 3x3 wall blocks covering roughly density of the map, corners kept clear."""
+    rng = random.Random(seed)
+    walls = []
+    covered = 0
+    target = density * rows * cols
+    while covered < target:
+        width, height = rng.randint(1, 3), rng.randint(1, 3)
+        x, y = rng.randrange(cols), rng.randrange(rows)
+        # Keep a 3x3 area around the marker and the goal open
+        if (x < 3 and y < 3) or (x + width > cols - 3 and y + height > rows - 3):
+            continue
+        walls.append((x, y, width, height))
+        covered += width * height
+    return MapSpec(rows, cols, (0, 0), [(cols - 1, rows - 1)], walls)
+
+
+def recursive_division(rows, cols, seed=0):
+    """Perfect maze by recursive division; passages run along even rows and columns."""
+    rng = random.Random(seed)
+    walls = []
+    chambers = [(0, 0, cols, rows)]  # Explicit stack, large mazes divide thousands of levels deep
+    while chambers:
+        x, y, width, height = chambers.pop()
+        if width < 3 and height < 3:
+            continue
+        horizontal = height > width or (height == width and rng.random() < 0.5)
+        if horizontal and height >= 3:
+            wall_row = y + rng.randrange(1, height - 1, 2)
+            gap = x + rng.randrange(0, width, 2)
+            if gap > x:
+                walls.append((x, wall_row, gap - x, 1))
+            if x + width > gap + 1:
+                walls.append((gap + 1, wall_row, x + width - gap - 1, 1))
+            chambers.append((x, y, width, wall_row - y))
+            chambers.append((x, wall_row + 1, width, y + height - wall_row - 1))
+        elif width >= 3:
+            wall_col = x + rng.randrange(1, width - 1, 2)
+            gap = y + rng.randrange(0, height, 2)
+            if gap > y:
+                walls.append((wall_col, y, 1, gap - y))
+            if y + height > gap + 1:
+                walls.append((wall_col, gap + 1, 1, y + height - gap - 1))
+            chambers.append((x, y, wall_col - x, height))
+            chambers.append((wall_col + 1, y, x + width - wall_col - 1, height))
+    goal = ((cols - 1) // 2 * 2, (rows - 1) // 2 * 2)
+    return MapSpec(rows, cols, (0, 0), [goal], walls)
+
+
+def corridor(rows, cols, seed=0):
+    """Serpentine corridor: every other row is a wall open at alternating ends, so the path visits every open cell."""
+    walls = []
+    for index, row in enumerate(range(1, rows, 2)):
+        walls.append((0, row, cols - 1, 1) if index % 2 == 0 else (1, row, cols - 1, 1))
+    last_row = (rows - 1) // 2 * 2
+    goal_col = cols - 1 if (last_row // 2) % 2 == 0 else 0
+    return MapSpec(rows, cols, (0, 0), [(goal_col, last_row)], walls)
+
+
+GENERATORS = {
+    "open": open_field,
+    "random": random_obstacles,
+    "maze": recursive_division,
+    "corridor": corridor
+}
+
+
+def generate(family, rows, cols, seed=0):
+    """Generate a map of the given family."""
+    try:
+        generator = GENERATORS[family]
+    except KeyError:
+        raise ValueError(f"Unknown map family '{family}'. Choose from {', '.join(FAMILIES)}.") from None
+    return generator(rows, cols, seed)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write a seeded synthetic map in the input file format.")
+    parser.add_argument("family", choices=FAMILIES)
+    parser.add_argument("rows", type=int)
+    parser.add_argument("cols", type=int)
+    parser.add_argument("output")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    generate(args.family, args.rows, args.cols, args.seed).write(args.output)
+
+
+if __name__ == "__main__":
+    main()
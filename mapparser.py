@@ -0,0 +1,127 @@
+import mmap
+import re
+from gridmap import Grid
+
+# Precompiled patterns, matched directly against the memory-mapped file
+_DIMENSIONS = re.compile(rb"[ \t]*\[[ \t]*(\d+)[ \t]*,[ \t]*(\d+)[ \t]*\]")
+_POINT = re.compile(rb"\([ \t]*(\d+)[ \t]*,[ \t]*(\d+)[ \t]*\)")
+_WALL = re.compile(rb"\((\d+),[ \t]*(\d+),[ \t]*(\d+),[ \t]*(\d+)\)")
+# Wall lines are the lines that start with "(", anything else after the third line is a comment.
+# Captures the first rectangle (all None if it is malformed) and the rest of the line.
+_WALL_LINE = re.compile(rb"^[ \t]*\((?:(\d+),[ \t]*(\d+),[ \t]*(\d+),[ \t]*(\d+)\))?(.*)$", re.MULTILINE)
+
+
+class MapParseError(ValueError):
+    """A map file that cannot be parsed, with the 1-based line and column of the problem."""
+
+    def __init__(self, message, path=None, line=None, column=None):
+        self.message = message
+        self.path = path
+        self.line = line
+        self.column = column
+        location = ":".join(str(part) for part in (path, line, column) if part is not None)
+        super().__init__(f"{location}: {message}" if location else message)
+
+
+def _position(data, offset):
+    # 1-based (line, column) of a byte offset
+    line_start = data.rfind(b"\n", 0, offset) + 1
+    return data[:offset].count(b"\n") + 1, offset - line_start + 1
+
+
+def _line_end(data, start):
+    end = data.find(b"\n", start)
+    return len(data) if end == -1 else end
+
+
+def parse_map(data, path=None):
+    """Parse map text (bytes, bytearray or mmap) into (rows, cols, marker, goals, Grid).
+
+    Wall rectangles are written straight into the Grid. Problems raise
+    MapParseError pointing at the offending line and column.
+    """
+    def fail(message, offset):
+        line, column = _position(data, offset)
+        raise MapParseError(message, path, line, column)
+
+    # First line: grid dimensions
+    match = _DIMENSIONS.match(data, 0, _line_end(data, 0))
+    if not match:
+        fail("expected grid dimensions as [rows,cols]", 0)
+    rows, cols = int(match.group(1)), int(match.group(2))
+    if rows <= 0 or cols <= 0:
+        fail(f"grid dimensions must be positive, got [{rows},{cols}]", match.start(1))
+
+    # Second line: marker coordinates
+    start = _line_end(data, 0) + 1
+    end = _line_end(data, start)
+    match = _POINT.search(data, start, end)
+    if not match:
+        fail("expected the marker position as (col,row)", start)
+    marker = int(match.group(1)), int(match.group(2))
+    if not (0 <= marker[0] < cols and 0 <= marker[1] < rows):
+        fail(f"marker {marker} is outside the {rows}x{cols} grid", match.start())
+
+    # Third line: goal states
+    start = end + 1
+    end = _line_end(data, start)
+    goals = []
+    for match in _POINT.finditer(data, start, end):
+        goal = int(match.group(1)), int(match.group(2))
+        if not (0 <= goal[0] < cols and 0 <= goal[1] < rows):
+            fail(f"goal {goal} is outside the {rows}x{cols} grid", match.start())
+        goals.append(goal)
+    if not goals:
+        fail("expected one or more goal positions as (col,row) | (col,row)", start)
+
+    # Remaining lines: walls, filled straight into the grid's passability array
+    grid = Grid(rows, cols)
+    cells = grid.cells
+    spans = {}  # width -> run of wall bytes
+    for line in _WALL_LINE.finditer(data, end + 1):
+        x, y, width, height, rest = line.groups()
+        if x is None:
+            fail("expected a wall as (x,y,width,height)", data.find(b"(", line.start()))
+        rectangles = [(int(x), int(y), int(width), int(height))]
+        # More walls on the line, each of them must be well formed too; a trailing // comment is skipped
+        position, line_end = line.start(5), line.end(5)
+        comment = data.find(b"//", position, line_end)
+        if comment != -1:
+            line_end = comment
+        while True:
+            position = data.find(b"(", position, line_end)
+            if position == -1:
+                break
+            wall = _WALL.match(data, position, line_end)
+            if wall is None:
+                fail("expected a wall as (x,y,width,height)", position)
+            rectangles.append(tuple(map(int, wall.groups())))
+            position = wall.end()
+        for x, y, width, height in rectangles:
+            # Same clipping as Grid.add_wall, without a method call per rectangle
+            first_col, last_col = max(x, 0), min(x + width, cols)
+            if first_col >= last_col:
+                continue
+            span = spans.get(last_col - first_col)
+            if span is None:
+                span = spans[last_col - first_col] = b"\x01" * (last_col - first_col)
+            for row in range(max(y, 0), min(y + height, rows)):
+                base = row * cols
+                cells[base + first_col:base + last_col] = span
+    grid.mark_changed()
+    return rows, cols, marker, goals, grid
+
+
+def parse_input_file(input_file):
+    """Parse a map file into (rows, cols, marker, goals, Grid), memory-mapping it.
+
+    Raises MapParseError for malformed maps and OSError if the file cannot be read.
+    """
+    with open(input_file, "rb") as file:
+        try:
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # mmap cannot map an empty file
+            raise MapParseError("the map file is empty", input_file, 1, 1) from None
+        with data:
+            return parse_map(data, input_file)
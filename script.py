@@ -1,70 +1,113 @@
 import sys
-from gui import create_grid_window
-from wall import add_wall_coordinates
-import re
+from searchstrategy import STRATEGIES, solve, format_result
+from tour import solve_tour
+from mapparser import MapParseError, parse_input_file  # parse_input_file is re-exported for existing callers
+from compiledmap import load_map
 
-def parse_input_file(input_file):
-    """Parse the input file to extract grid dimensions, marker, goals, and walls."""
-    try:
-        with open(input_file, 'r') as file:
-            # First line: grid dimensions
-            first_line = file.readline().strip()
-            grid_line = first_line.split(']')[0] + ']'
-            grid_dimensions = grid_line.strip('[]').split(',')
-            rows, cols = int(grid_dimensions[0].strip()), int(grid_dimensions[1].strip())
-
-            # Second line: marker coordinates
-            second_line = file.readline().strip()
-            coord_line = second_line.split(')')[0] + ')'
-            coordinates = coord_line.strip('()').split(',')
-            col_idx, row_idx = int(coordinates[0].strip()), int(coordinates[1].strip())
-
-            # Third line: goal states
-            third_line = file.readline().strip()
-            goal_coords = re.findall(r'\((\d+),\s*(\d+)\)', third_line)
-            goals = [(int(col), int(row)) for col, row in goal_coords]
-
-            # Remaining lines: walls
-            walls = []
-            for line in file:
-                line = line.strip()
-                if line.startswith('('):
-                    wall_data = re.findall(r'\((\d+),\s*(\d+),\s*(\d+),\s*(\d+)\)', line)
-                    for (start_col, start_row, width, height) in wall_data:
-                        wall_coords = add_wall_coordinates(int(start_col), int(start_row), int(width), int(height))
-                        walls.extend(wall_coords)
+def run_headless(rows, cols, marker, goals, walls, method, find_multiple_paths=False, input_file=None, trace_file=None):
+    """Run the search without opening a window and print the results.
 
-        return rows, cols, (col_idx, row_idx), goals, walls
-
-    except FileNotFoundError:
-        print(f"Error: The file '{input_file}' was not found.")
-        sys.exit(1)
-    except ValueError as e:
-        print(f"Error: Unable to parse grid dimensions or coordinates. {e}")
-        sys.exit(1)
+    trace_file records the search and saves the trace for a later replay.
+    """
+    if trace_file:
+        from searchtrace import record
+        result, trace = record(method, marker, goals, walls, rows, cols, find_multiple_paths)
+        trace.save(trace_file)
+    elif find_multiple_paths:
+        result = solve_tour(method, marker, goals, walls, rows, cols)
+    else:
+        result = solve(method, marker, goals, walls, rows, cols)
+    report = format_result(result, method, goals, find_multiple_paths, input_file)
+    if report:
+        for line in report:
+            print(line)
+    else:
+        print("No path found.")
+    return result
 
 def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "batch":
+        from batch import main as batch_main
+        batch_main(sys.argv[2:])
+        return
+    if len(sys.argv) > 1 and sys.argv[1] == "compile":
+        from compiledmap import main as compile_main
+        compile_main(sys.argv[2:])
+        return
+    if len(sys.argv) > 1 and sys.argv[1] == "compare":
+        from compare import main as compare_main
+        compare_main(sys.argv[2:])
+        return
+    if len(sys.argv) > 1 and sys.argv[1] == "serve":
+        from service import main as serve_main
+        serve_main(sys.argv[2:])
+        return
+    if len(sys.argv) > 1 and sys.argv[1] == "replay":
+        replay(sys.argv[2:])
+        return
+
     if len(sys.argv) < 3:
-        print("Usage: python script.py <input_file> <method> [multiple]")
+        print("Usage: python script.py <input_file> <method> [multiple] [headless] [trace=<trace_file>]")
+        print("       python script.py batch <directory_or_glob> [<method> ...] [options]")
+        print("       python script.py compile <input_file> [<output_file>] [--no-labels]")
+        print("       python script.py compare <input_file> [<method> ...] [--multiple] [--csv <file>]")
+        print("       python script.py replay <trace_file>")
+        print("       python script.py serve [--host <host>] [--port <port>]")
         sys.exit(1)
 
     input_file = sys.argv[1]
     method = sys.argv[2].upper()
 
-    # Handle optional argument for finding multiple goals
+    # Handle optional arguments for finding multiple goals and running without a window
     find_multiple_paths = False
-    if len(sys.argv) == 4 and sys.argv[3].lower() == "multiple":
-        find_multiple_paths = True
-    else:
-        if len(sys.argv) == 4:
-            print("Warning: Ignoring unknown argument. Use 'multiple' to find multiple paths.")
+    headless = False
+    trace_file = None
+    for option in sys.argv[3:]:
+        if option.lower() == "multiple":
+            find_multiple_paths = True
+        elif option.lower() == "headless":
+            headless = True
+        elif option.lower().startswith("trace="):
+            trace_file = option[len("trace="):]
+        else:
+            print("Warning: Ignoring unknown argument. Use 'multiple' to find multiple paths, 'headless' to run without a window or 'trace=<file>' to save the search.")
             sys.exit(1)
 
-    # Parse the input file
-    rows, cols, marker, goals, walls = parse_input_file(input_file)
+    if method not in STRATEGIES:
+        print(f"Method '{method}' not supported.")
+        sys.exit(1)
+
+    # Load the input file, text or compiled, through the compiled map cache next to it
+    try:
+        rows, cols, marker, goals, walls = load_map(input_file)
+    except FileNotFoundError:
+        print(f"Error: The file '{input_file}' was not found.")
+        sys.exit(1)
+    except (MapParseError, OSError) as e:
+        print(f"Error: Unable to parse the map. {e}")
+        sys.exit(1)
+
+    if headless:
+        run_headless(rows, cols, marker, goals, walls, method, find_multiple_paths, input_file, trace_file)
+        return
 
     # Create and display the grid in the GUI with the option for multiple paths
-    create_grid_window(rows, cols, marker, goals, walls, method, find_multiple_paths=find_multiple_paths, input_file=input_file)
+    from gui import create_grid_window  # Imported here so headless runs never load tkinter
+    create_grid_window(rows, cols, marker, goals, walls, method, find_multiple_paths=find_multiple_paths, input_file=input_file, trace_file=trace_file)
+
+def replay(argv):
+    """Open the window on a trace saved with trace=<file>, without running the search again."""
+    if len(argv) != 1:
+        print("Usage: python script.py replay <trace_file>")
+        sys.exit(1)
+    from searchtrace import load_trace
+    try:
+        trace = load_trace(argv[0])
+    except (ValueError, OSError) as e:
+        print(f"Error: Unable to load the trace. {e}")
+        sys.exit(1)
+    from gui import replay_trace_window
+    replay_trace_window(trace, input_file=argv[0])
 
 if __name__ == "__main__":
     main()
@@ -1,501 +1,823 @@
-import time
-import heapq
-from collections import deque
-from grid import create_yellow_square, move_yellow_square, highlight_final_path
-
-
-def dfs(marker, goals, walls, rows, cols, canvas, cell_size, find_multiple_paths=False):
-    full_path = []
+from array import array
+from gridmap import Grid, as_grid
+from heuristic import UNREACHABLE, HeuristicField, heuristic_field
+from indexedheap import IndexedHeap
+from wavefront import UNREACHED  # g-score of cells that have not been reached yet
+
+# Strategies never touch the GUI. Progress is reported through an optional
+# observer callable, observer(event, cell), with one of these events:
+#   "start"    a search (re)starts from cell
+#   "visit"    cell is taken off the frontier and expanded
+#   "generate" cell is added to the frontier
+#   "goal"     cell is a goal that has just been reached
+#   "reset"    the visualised frontier is discarded before the next search
+# With no observer attached the searches run without any per-node overhead.
+# The heap-based searches take their open list type as heap= (IndexedHeap by
+# default), so tools can count heap operations per call without patching this module.
+
+INFINITY = float('inf')
+
+# Default cap on the IDA* transposition table (entries per bound iteration)
+TRANSPOSITION_LIMIT = 1 << 20
+
+
+def dfs(marker, goals, walls, rows, cols, find_multiple_paths=False, observer=None):
+    if find_multiple_paths:
+        return _solve_tour("DFS", marker, goals, walls, rows, cols, observer)
+    grid = as_grid(walls, rows, cols)
+    goals = grid.reachable_goals(marker, goals)  # Drop walled-off goals up front, see Grid.components
     node_count = 0
     steps = []
     remaining_goals = set(goals)
-    highlighted_nodes = []
-    global_visited = set()  # Global set to keep track of all visited nodes
-
-    while remaining_goals:
-        stack = [(marker, [marker])]
-        visited = set()
-        parent = {marker: None}
-        yellow_square = create_yellow_square(canvas, marker[0], marker[1], cell_size)
-
-        while stack:
-            current, path = stack.pop()
-
-            if current in visited:
-                continue
-            visited.add(current)
-            global_visited.add(current)
-            node_count += 1
-            steps.append(('move', current))
-
-            # Move yellow square and highlight visited node in light gray
-            rect_id = canvas.create_rectangle(
-                current[0] * cell_size, current[1] * cell_size,
-                (current[0] + 1) * cell_size, (current[1] + 1) * cell_size,
-                fill="lightgray", outline="black"
-            )
-            highlighted_nodes.append(rect_id)
-            move_yellow_square(canvas, yellow_square, current[0], current[1], cell_size)
-            canvas.update()
-            time.sleep(0.05)
-
-            # Goal check
-            if current in remaining_goals:
-                remaining_goals.remove(current)
-                canvas.delete(yellow_square)
-
-                # Accumulate the path to this goal
-                if full_path and full_path[-1] == path[0]:
-                    full_path.extend(path[1:])
-                else:
-                    full_path.extend(path)
-
-                # If not finding multiple paths, exit after reaching the first goal
-                if not find_multiple_paths:
-                    directions = convert_path_to_directions(full_path)
-                    return full_path, node_count, directions, parent, steps
-
-                # Clear the highlighted nodes
-                for node_id in highlighted_nodes:
-                    canvas.delete(node_id)
-                highlighted_nodes.clear()
-
-                # Reset for the next goal
-                marker = current  # Start next search from the current goal
-                break  # Exit the inner while loop to start the next search
-
-            # Expand neighbors
-            neighbors = get_neighbors(current, walls, rows, cols)
-            for neighbor in neighbors:
-                if neighbor not in visited:
-                    stack.append((neighbor, path + [neighbor]))
-                    parent[neighbor] = current
-                    # Highlight expanded node in light green
-                    rect_id = canvas.create_rectangle(
-                        neighbor[0] * cell_size, neighbor[1] * cell_size,
-                        (neighbor[0] + 1) * cell_size, (neighbor[1] + 1) * cell_size,
-                        fill="lightgreen", outline="black"
-                    )
-                    highlighted_nodes.append(rect_id)
-                    canvas.update()
-                    time.sleep(0.05)
-        else:
-            # If stack is empty and goals remain, but no path is found
-            if remaining_goals:
-                directions = convert_path_to_directions(full_path)
-                return full_path, node_count, directions, parent, steps
-
-    canvas.delete(yellow_square)
-    directions = convert_path_to_directions(full_path)
-    return full_path, node_count, directions, parent, steps
-
-
-
+    # The stack holds (cell index, parent index) pairs flattened into one int array
+    stack = array('i', (grid.index(marker), -1))
+    visited = bytearray(grid.size)
+    parent = array('i', [-1]) * grid.size
+    if observer:
+        observer("start", marker)
+
+    while stack and remaining_goals:
+        from_index = stack.pop()
+        index = stack.pop()
+
+        if visited[index]:
+            continue
+        visited[index] = 1
+        parent[index] = from_index
+        current = grid.cell(index)
+        node_count += 1
+        steps.append(('move', current))
+        if observer:
+            observer("visit", current)
 
+        # Goal check, the first goal reached ends the search
+        if current in remaining_goals:
+            if observer:
+                observer("goal", current)
+            full_path = reconstruct_path(parent, index, grid)
+            directions = convert_path_to_directions(full_path)
+            return full_path, node_count, directions, parent, steps
 
-def bfs(marker, goals, walls, rows, cols, canvas, cell_size, find_multiple_paths=False):
-    queue = deque([(marker, [marker])])
-    visited = set()
-    parent = {marker: None}
+        # Expand neighbors
+        for neighbor in grid.neighbor_indices(index):
+            if not visited[neighbor]:
+                stack.append(neighbor)
+                stack.append(index)
+                if observer:
+                    observer("generate", grid.cell(neighbor))
+
+    return [], node_count, [], parent, steps
+
+
+def bfs(marker, goals, walls, rows, cols, find_multiple_paths=False, observer=None):
+    if find_multiple_paths:
+        return _solve_tour("BFS", marker, goals, walls, rows, cols, observer)
+    grid = as_grid(walls, rows, cols)
+    goals = grid.reachable_goals(marker, goals)  # Drop walled-off goals up front, see Grid.components
+    # The queue is an int array of cell indices consumed from head; each cell is queued once
+    queue = array('i', [grid.index(marker)])
+    head = 0
+    # 0 = unseen, 1 = queued, 2 = expanded
+    state = bytearray(grid.size)
+    state[queue[0]] = 1
+    parent = array('i', [-1]) * grid.size
     node_count = 0
     steps = []
     full_path = []
     remaining_goals = set(goals)
-    yellow_square = create_yellow_square(canvas, marker[0], marker[1], cell_size)
-    highlighted_nodes = []
-
-    while queue and remaining_goals:
-        current, path = queue.popleft()
-
-        if current in visited:
-            continue
-        visited.add(current)
+    if observer:
+        observer("start", marker)
+
+    while head < len(queue) and remaining_goals:
+        index = queue[head]
+        head += 1
+        state[index] = 2
+        current = grid.cell(index)
         node_count += 1
         steps.append(('move', current))
+        if observer:
+            observer("visit", current)
 
-        # Move yellow square and highlight the current node as visited (lightgray)
-        rect_id = canvas.create_rectangle(current[0] * cell_size, current[1] * cell_size,
-                                          (current[0] + 1) * cell_size, (current[1] + 1) * cell_size,
-                                          fill="lightgray", outline="black")
-        highlighted_nodes.append(rect_id)
-        canvas.update()
-        move_yellow_square(canvas, yellow_square, current[0], current[1], cell_size)
-        time.sleep(0.05)
-
-        # Goal check
+        # Goal check, the first goal reached ends the search
         if current in remaining_goals:
-            remaining_goals.remove(current)
-            # remove the yellow square if the goal is reached
-            canvas.delete(yellow_square)
-            # Reconstruct and accumulate the path to this goal
-            goal_path = reconstruct_path(parent, current)
-            full_path.extend(goal_path)
-
-            # If not finding multiple paths, exit after reaching the first goal
-            if not find_multiple_paths:
-                directions = convert_path_to_directions(full_path)
-                return full_path, node_count, directions, parent, steps
-
-            # Clear the highlighted nodes
-            for node_id in highlighted_nodes:
-                canvas.delete(node_id)
-            highlighted_nodes.clear()
-
-            # Reset the queue and visited set for the next goal
-            queue = deque([(current, [current])])
-            visited = set()
-            parent = {current: None}
-            # Redraw the yellow square at the current position
-            yellow_square = create_yellow_square(canvas, current[0], current[1], cell_size)
+            if observer:
+                observer("goal", current)
+            full_path = reconstruct_path(parent, index, grid)
+            directions = convert_path_to_directions(full_path)
+            return full_path, node_count, directions, parent, steps
 
         # Expand neighbors
-        neighbors = get_neighbors(current, walls, rows, cols)
-        for neighbor in neighbors:
-            if neighbor not in visited:
-                queue.append((neighbor, path + [neighbor]))
-                parent[neighbor] = current
-                # Highlight expanded node in light green
-                rect_id = canvas.create_rectangle(neighbor[0] * cell_size, neighbor[1] * cell_size,
-                                                  (neighbor[0] + 1) * cell_size, (neighbor[1] + 1) * cell_size,
-                                                  fill="lightgreen", outline="black")
-                highlighted_nodes.append(rect_id)
-                canvas.update()
-                time.sleep(0.05)
-
-    canvas.delete(yellow_square)
+        for neighbor in grid.neighbor_indices(index):
+            if state[neighbor] != 2:
+                # The latest expanded neighbour becomes the parent, as with the old parent dict
+                parent[neighbor] = index
+                if not state[neighbor]:
+                    state[neighbor] = 1
+                    queue.append(neighbor)
+                if observer:
+                    observer("generate", grid.cell(neighbor))
+
     directions = convert_path_to_directions(full_path)
     return full_path, node_count, directions, parent, steps
 
-def gbfs(marker, goals, walls, rows, cols, canvas, cell_size, find_multiple_paths=False):
-    open_list = []
-    heapq.heappush(open_list, (0, marker))
-    closed_list = set()
-    came_from = {marker: None}
+def gbfs(marker, goals, walls, rows, cols, find_multiple_paths=False, observer=None, heuristic="manhattan",
+         heap=IndexedHeap):
+    if find_multiple_paths:
+        return _solve_tour("GBFS", marker, goals, walls, rows, cols, observer, heuristic=heuristic, heap=heap)
+    grid = as_grid(walls, rows, cols)
+    goals = grid.reachable_goals(marker, goals)  # Drop walled-off goals up front, see Grid.components
+    # Precomputed distance to the nearest goal, see heuristic.HeuristicField
+    h = heuristic_field(heuristic, grid, goals).values
+    open_list = heap()  # cell index -> (heuristic, cell)
+    open_list.push(grid.index(marker), (0, marker))
+    closed_list = bytearray(grid.size)
+    came_from = array('i', [-1]) * grid.size
     node_count = 0
     steps = []
     full_path = []
     remaining_goals = set(goals)
-    yellow_square = create_yellow_square(canvas, marker[0], marker[1], cell_size)
-    highlighted_nodes = []
+    if observer:
+        observer("start", marker)
 
-    while open_list:
+    while open_list and remaining_goals:
         # Extract the node with the lowest heuristic
-        _, current = heapq.heappop(open_list)
+        index, (_, current) = open_list.pop()
 
-        if current in closed_list:
+        if closed_list[index]:
             continue
 
-        closed_list.add(current)
+        closed_list[index] = 1
         node_count += 1
         steps.append(('move', current))
+        if observer:
+            observer("visit", current)
 
-        # Move the yellow square to the current node and highlight it as visited (light gray)
-        if current not in goals:
-            rect_id = canvas.create_rectangle(current[0] * cell_size, current[1] * cell_size,
-                                              (current[0] + 1) * cell_size, (current[1] + 1) * cell_size,
-                                              fill="lightgray", outline="black")
-            highlighted_nodes.append(rect_id)
+        # Goal check, the first goal reached ends the search
+        if current in remaining_goals:
+            if observer:
+                observer("goal", current)
+            full_path = reconstruct_path(came_from, index, grid)
+            directions = convert_path_to_directions(full_path)
+            return full_path, node_count, directions, came_from, steps
 
-        move_yellow_square(canvas, yellow_square, current[0], current[1], cell_size)
-        canvas.update()
-        time.sleep(0.05)
+        # Expand neighbors
+        for neighbor_index in grid.neighbor_indices(index):
+            if not closed_list[neighbor_index] and neighbor_index not in open_list:
+                if h[neighbor_index] == UNREACHABLE:
+                    continue  # No goal can be reached from this cell
+                neighbor = grid.cell(neighbor_index)
+                open_list.push(neighbor_index, (h[neighbor_index], neighbor))
+                came_from[neighbor_index] = index
+                if observer:
+                    observer("generate", neighbor)
 
-        # Goal check
-        if current in remaining_goals:
-            remaining_goals.remove(current)
-            canvas.delete(yellow_square)
-            # Reconstruct and accumulate the path to this goal
-            goal_path = reconstruct_path(came_from, current)
-            full_path.extend(goal_path)
-
-            # If not finding multiple paths, exit after reaching the first goal
-            if not find_multiple_paths:
-                directions = convert_path_to_directions(full_path)
-                return full_path, node_count, directions, came_from, steps
-
-            # Clear the highlighted nodes
-            for node_id in highlighted_nodes:
-                canvas.delete(node_id)
-            highlighted_nodes.clear()
-
-            # Reset open list and visited set for the next goal, keeping the previously found path
-            open_list = []
-            heapq.heappush(open_list, (0, current))
-            came_from = {current: None}
-            yellow_square = create_yellow_square(canvas, current[0], current[1], cell_size)
-
-        # Expand neighbors with updated heuristic for remaining goals
-        neighbors = get_neighbors(current, walls, rows, cols)
-        if remaining_goals:  # Ensure remaining_goals is not empty
-            for neighbor in neighbors:
-                if neighbor not in closed_list and neighbor not in [item[1] for item in open_list]:
-                    # Calculate heuristic only based on the nearest remaining goal
-                    heuristic = min(manhattan_distance(neighbor, goal) for goal in remaining_goals)
-                    heapq.heappush(open_list, (heuristic, neighbor))
-                    came_from[neighbor] = current
-                    # Highlight expanded node in light green
-                    rect_id = canvas.create_rectangle(neighbor[0] * cell_size, neighbor[1] * cell_size,
-                                                      (neighbor[0] + 1) * cell_size, (neighbor[1] + 1) * cell_size,
-                                                      fill="lightgreen", outline="black")
-                    highlighted_nodes.append(rect_id)
-                    canvas.update()
-                    time.sleep(0.05)
-
-    canvas.delete(yellow_square)    
     directions = convert_path_to_directions(full_path)
     return full_path, node_count, directions, came_from, steps
 
 
 
-def a_star(marker, goals, walls, rows, cols, canvas, cell_size, find_multiple_paths=False):
-    open_list = []
-    heapq.heappush(open_list, (0, 0, marker))  # (f_score, g_score, position)
+def a_star(marker, goals, walls, rows, cols, find_multiple_paths=False, observer=None, heuristic="manhattan",
+           heap=IndexedHeap):
+    if find_multiple_paths:
+        return _solve_tour("AS", marker, goals, walls, rows, cols, observer, heuristic=heuristic, heap=heap)
+    grid = as_grid(walls, rows, cols)
+    goals = grid.reachable_goals(marker, goals)  # Drop walled-off goals up front, see Grid.components
+    # Precomputed distance to the nearest goal, see heuristic.HeuristicField
+    h = heuristic_field(heuristic, grid, goals).values
+    start = grid.index(marker)
+    open_list = heap()  # cell index -> (f_score, g_score, position)
+    open_list.push(start, (0, 0, marker))
 
-    came_from = {marker: None}
-    g_score = {marker: 0}
-    f_score = {marker: min(manhattan_distance(marker, goal) for goal in goals)}
-    visited = set()
+    came_from = array('i', [-1]) * grid.size
+    g_score = array('i', [UNREACHED]) * grid.size
+    g_score[start] = 0
+    visited = bytearray(grid.size)
     node_count = 0
     steps = []
     full_path = []
     remaining_goals = set(goals)
-    yellow_square = create_yellow_square(canvas, marker[0], marker[1], cell_size)
-    highlighted_nodes = []
+    if observer:
+        observer("start", marker)
 
     while open_list and remaining_goals:
         # Extract the node with the lowest f_score
-        current_f, current_g, current = heapq.heappop(open_list)
+        index, (current_f, current_g, current) = open_list.pop()
 
-        if current in visited:
-            continue
-        visited.add(current)
+        visited[index] = 1
         node_count += 1
         steps.append(('move', current))
+        if observer:
+            observer("visit", current)
+
+        # Goal check, the first goal reached ends the search
+        if current in remaining_goals:
+            full_path = reconstruct_path(came_from, index, grid)
+            if observer:
+                observer("goal", current)
+            directions = convert_path_to_directions(full_path)
+            return full_path, node_count, directions, visited, steps
+
+        # Expand neighbors, lowering the key of neighbours already on the open list
+        tentative_g_score = g_score[index] + 1
+        for neighbor_index in grid.neighbor_indices(index):
+            if not visited[neighbor_index] and tentative_g_score < g_score[neighbor_index]:
+                if h[neighbor_index] == UNREACHABLE:
+                    continue  # No goal can be reached from this cell
+                neighbor = grid.cell(neighbor_index)
+                came_from[neighbor_index] = index
+                g_score[neighbor_index] = tentative_g_score
+                f_score = tentative_g_score + h[neighbor_index]
+                if neighbor_index in open_list:
+                    open_list.decrease_key(neighbor_index, (f_score, tentative_g_score, neighbor))
+                else:
+                    open_list.push(neighbor_index, (f_score, tentative_g_score, neighbor))
+                if observer:
+                    observer("generate", neighbor)
+
+    directions = convert_path_to_directions(full_path)
+    return full_path, node_count, directions, visited, steps
+
+def jps(marker, goals, walls, rows, cols, find_multiple_paths=False, observer=None, heuristic="manhattan",
+        heap=IndexedHeap):
+    """Jump Point Search for 4-connected uniform-cost grids.
+
+    A* over jump points only: straight runs without forced neighbours are
+    skipped in a single scan instead of pushing every cell on the open list.
+    Follows the PathFinding.js never-diagonal jump rules, with the jumps
+    written as loops. Returns the same tuple as a_star with an equally short path.
+    """
+    if find_multiple_paths:
+        return _solve_tour("JPS", marker, goals, walls, rows, cols, observer, heuristic=heuristic, heap=heap)
+    grid = as_grid(walls, rows, cols)
+    goals = grid.reachable_goals(marker, goals)  # Drop walled-off goals up front, see Grid.components
+    h = heuristic_field(heuristic, grid, goals).values
+    cells = grid.cells
+    is_goal = bytearray(grid.size)
+    for goal in goals:
+        if grid.in_bounds(goal):
+            is_goal[grid.index(goal)] = 1
+
+    def jump_horizontal(index, step):
+        # Scan along the row until a wall, a goal or a cell with a forced neighbour above or below
+        col = index % cols
+        while True:
+            col += step
+            index += step
+            if col < 0 or col >= cols or cells[index]:
+                return -1
+            if is_goal[index]:
+                return index
+            if index >= cols and not cells[index - cols] and cells[index - cols - step]:
+                return index
+            if index < grid.size - cols and not cells[index + cols] and cells[index + cols - step]:
+                return index
+
+    def jump_vertical(index, step):
+        # Like jump_horizontal, but a cell is also a jump point if a horizontal scan from it finds one
+        col = index % cols
+        while True:
+            index += step
+            if index < 0 or index >= grid.size or cells[index]:
+                return -1
+            if is_goal[index]:
+                return index
+            if col > 0 and not cells[index - 1] and cells[index - 1 - step]:
+                return index
+            if col < cols - 1 and not cells[index + 1] and cells[index + 1 - step]:
+                return index
+            if jump_horizontal(index, 1) != -1 or jump_horizontal(index, -1) != -1:
+                return index
+
+    start = grid.index(marker)
+    open_list = heap()  # jump point index -> (f_score, g_score, position)
+    open_list.push(start, (0, 0, marker))
+    came_from = array('i', [-1]) * grid.size
+    g_score = array('i', [UNREACHED]) * grid.size
+    g_score[start] = 0
+    visited = bytearray(grid.size)
+    node_count = 0
+    steps = []
+    full_path = []
+    remaining_goals = set(goals)
+    if observer:
+        observer("start", marker)
 
-        # Move yellow square and highlight visited node in light gray
-        move_yellow_square(canvas, yellow_square, current[0], current[1], cell_size)
-        rect_id = canvas.create_rectangle(current[0] * cell_size, current[1] * cell_size,
-                                          (current[0] + 1) * cell_size, (current[1] + 1) * cell_size,
-                                          fill="lightgray", outline="black")
-        highlighted_nodes.append(rect_id)
-        canvas.update()
-        time.sleep(0.05)
+    while open_list and remaining_goals:
+        index, (current_f, current_g, current) = open_list.pop()
+        visited[index] = 1
+        node_count += 1
+        steps.append(('move', current))
+        if observer:
+            observer("visit", current)
 
-        # Goal check
+        # Goal check, the first goal reached ends the search
         if current in remaining_goals:
-            remaining_goals.remove(current)
-            goal_path = reconstruct_path(came_from, current)
-            full_path.extend(goal_path)
-            canvas.delete(yellow_square)
-
-            # Clear the highlighted nodes
-            for node_id in highlighted_nodes:
-                canvas.delete(node_id)
-            highlighted_nodes.clear()
-
-            # If not finding multiple paths or no remaining goals, end search
-            if not find_multiple_paths or not remaining_goals:
-                if not remaining_goals:
-                    highlight_final_path(canvas, full_path, goals)  # Highlight the final path after all goals are found
-                directions = convert_path_to_directions(full_path)
-                return full_path, node_count, directions, visited, steps
-
-            # Reset search for next goal: clear open list, visited set, and adjust cost tracking
-            open_list = [(0, 0, current)]
-            visited = set()
-            came_from = {current: None}
-            g_score = {current: 0}
-            f_score = {current: min(manhattan_distance(current, goal) for goal in remaining_goals)}
-            yellow_square = create_yellow_square(canvas, current[0], current[1], cell_size)
+            full_path = interpolate_path(reconstruct_path(came_from, index, grid))
+            if observer:
+                observer("goal", current)
+            directions = convert_path_to_directions(full_path)
+            return full_path, node_count, directions, visited, steps
+
+        # Prune to the natural and forced directions for the way we arrived, as (jump, index step) pairs
+        parent = came_from[index]
+        if parent == -1:
+            directions = ((jump_horizontal, 1), (jump_horizontal, -1), (jump_vertical, cols), (jump_vertical, -cols))
+        elif parent // cols == index // cols:
+            step = 1 if index > parent else -1
+            directions = ((jump_horizontal, step), (jump_vertical, cols), (jump_vertical, -cols))
+        else:
+            step = cols if index > parent else -cols
+            directions = ((jump_vertical, step), (jump_horizontal, 1), (jump_horizontal, -1))
 
-        # Expand neighbors
-        neighbors = get_neighbors(current, walls, rows, cols)
-        for neighbor in neighbors:
-            tentative_g_score = g_score[current] + 1
-            if neighbor not in g_score or tentative_g_score < g_score[neighbor]:
-                came_from[neighbor] = current
-                g_score[neighbor] = tentative_g_score
-                f_score[neighbor] = tentative_g_score + min(manhattan_distance(neighbor, goal) for goal in remaining_goals)
-                heapq.heappush(open_list, (f_score[neighbor], tentative_g_score, neighbor))
-                # Highlight expanded node in light green
-                rect_id = canvas.create_rectangle(neighbor[0] * cell_size, neighbor[1] * cell_size,
-                                                  (neighbor[0] + 1) * cell_size, (neighbor[1] + 1) * cell_size,
-                                                  fill="lightgreen", outline="black")
-                highlighted_nodes.append(rect_id)
-                canvas.update()
-                time.sleep(0.05)
+        for jump, step in directions:
+            jump_point = jump(index, step)
+            if jump_point == -1 or visited[jump_point] or h[jump_point] == UNREACHABLE:
+                continue
+            tentative_g_score = current_g + (jump_point - index) // step
+            if tentative_g_score >= g_score[jump_point]:
+                continue
+            neighbor = grid.cell(jump_point)
+            came_from[jump_point] = index
+            g_score[jump_point] = tentative_g_score
+            f_score = tentative_g_score + h[jump_point]
+            if jump_point in open_list:
+                open_list.decrease_key(jump_point, (f_score, tentative_g_score, neighbor))
+            else:
+                open_list.push(jump_point, (f_score, tentative_g_score, neighbor))
+            if observer:
+                observer("generate", neighbor)
+
+    directions = convert_path_to_directions(full_path)
+    return full_path, node_count, directions, visited, steps
 
+def bidirectional_bfs(marker, goals, walls, rows, cols, find_multiple_paths=False, observer=None):
+    """Breadth-first search from the marker and goals[0] at once, stopping where the frontiers meet.
+
+    Each round expands one whole layer of the smaller frontier, and the round in
+    which the frontiers first touch is finished before choosing the shortest
+    meeting, so the path is as short as bfs finds. Multiple goals run one
+    bidirectional search per leg of the planned tour.
+    """
+    if find_multiple_paths:
+        return _solve_tour("BBFS", marker, goals, walls, rows, cols, observer)
+    grid = as_grid(walls, rows, cols)
+    start, goal = grid.index(marker), grid.index(goals[0])
+    # Per-side distance and parent arrays, index 0 searches forward from the marker, 1 backward from the goal
+    distance = (array('i', [UNREACHED]) * grid.size, array('i', [UNREACHED]) * grid.size)
+    parent = (array('i', [-1]) * grid.size, array('i', [-1]) * grid.size)
+    frontier = [array('i', [start]), array('i', [goal])]
+    distance[0][start] = distance[1][goal] = 0
+    visited = bytearray(grid.size)
+    node_count = 0
+    steps = []
+    best, meeting = UNREACHED, None
+    if observer:
+        observer("start", marker)
+    if start == goal:
+        best, meeting = 0, (start, goal)
+    elif grid.cells[goal] or not grid.reachable_goals(marker, goals[:1]):
+        return [], node_count, [], visited, steps
+
+    while meeting is None and frontier[0] and frontier[1]:
+        side = 0 if len(frontier[0]) <= len(frontier[1]) else 1
+        own, other, own_parent = distance[side], distance[1 - side], parent[side]
+        next_frontier = array('i')
+        for index in frontier[side]:
+            visited[index] = 1
+            current = grid.cell(index)
+            node_count += 1
+            steps.append(('move', current))
+            if observer:
+                observer("visit", current)
+            next_distance = own[index] + 1
+            for neighbor in grid.neighbor_indices(index):
+                if own[neighbor] == UNREACHED:
+                    own[neighbor] = next_distance
+                    own_parent[neighbor] = index
+                    next_frontier.append(neighbor)
+                    if observer:
+                        observer("generate", grid.cell(neighbor))
+                if other[neighbor] != UNREACHED and next_distance + other[neighbor] < best:
+                    best = next_distance + other[neighbor]
+                    meeting = (index, neighbor) if side == 0 else (neighbor, index)
+        frontier[side] = next_frontier
+
+    if meeting is None:
+        return [], node_count, [], visited, steps
+    # Forward half up to the meeting edge, then the backward parents down to the goal
+    full_path = reconstruct_path(parent[0], meeting[0], grid)
+    index = meeting[1]
+    if index != meeting[0]:
+        while index != -1:
+            full_path.append(grid.cell(index))
+            index = parent[1][index]
+    if observer:
+        observer("goal", goals[0])
+    directions = convert_path_to_directions(full_path)
+    return full_path, node_count, directions, visited, steps
+
+def bidirectional_a_star(marker, goals, walls, rows, cols, find_multiple_paths=False, observer=None,
+                         heuristic="manhattan", heap=IndexedHeap):
+    """A* from the marker towards goals[0] and from goals[0] back towards the marker.
+
+    Each side expands from its own open list, and the search stops once the
+    best meeting found is no longer than max(fmin forward, fmin backward),
+    which keeps the path optimal. Multiple goals run one bidirectional search
+    per leg of the planned tour. A prebuilt HeuristicField only chooses the
+    mode: each side needs its own field, towards goals[0] and towards the marker.
+    """
+    if find_multiple_paths:
+        return _solve_tour("BAS", marker, goals, walls, rows, cols, observer, heuristic=heuristic, heap=heap)
+    grid = as_grid(walls, rows, cols)
+    start, goal = grid.index(marker), grid.index(goals[0])
+    # Index 0 searches forward towards the goal, 1 backward towards the marker
+    mode = heuristic.mode if isinstance(heuristic, HeuristicField) else heuristic
+    h = (HeuristicField(grid, [goals[0]], mode).values, HeuristicField(grid, [marker], mode).values)
+    g_score = (array('i', [UNREACHED]) * grid.size, array('i', [UNREACHED]) * grid.size)
+    came_from = (array('i', [-1]) * grid.size, array('i', [-1]) * grid.size)
+    closed = (bytearray(grid.size), bytearray(grid.size))
+    # cell index -> (f_score, -g_score, position); ties go to the deeper cell so each side runs straight on
+    open_lists = (heap(), heap())
+    g_score[0][start] = g_score[1][goal] = 0
+    open_lists[0].push(start, (h[0][start], 0, marker))
+    open_lists[1].push(goal, (h[1][goal], 0, goals[0]))
+    visited = bytearray(grid.size)
+    node_count = 0
+    steps = []
+    best, meeting = UNREACHED, None
+    if observer:
+        observer("start", marker)
+    if start == goal:
+        best, meeting = 0, (start, goal)
+    elif grid.cells[goal] or not grid.reachable_goals(marker, goals[:1]):
+        return [], node_count, [], visited, steps
+
+    while open_lists[0] and open_lists[1]:
+        if best <= max(open_lists[0].peek()[1][0], open_lists[1].peek()[1][0]):
+            break
+        side = 0 if len(open_lists[0]) <= len(open_lists[1]) else 1
+        open_list, own_g, other_g = open_lists[side], g_score[side], g_score[1 - side]
+        own_h, own_from, own_closed = h[side], came_from[side], closed[side]
+        index, (current_f, current_g, current) = open_list.pop()
+        current_g = -current_g
+        own_closed[index] = 1
+        visited[index] = 1
+        node_count += 1
+        steps.append(('move', current))
+        if observer:
+            observer("visit", current)
+
+        tentative_g_score = current_g + 1
+        for neighbor_index in grid.neighbor_indices(index):
+            if other_g[neighbor_index] != UNREACHED and tentative_g_score + other_g[neighbor_index] < best:
+                best = tentative_g_score + other_g[neighbor_index]
+                meeting = (index, neighbor_index) if side == 0 else (neighbor_index, index)
+            if own_closed[neighbor_index] or tentative_g_score >= own_g[neighbor_index]:
+                continue
+            if own_h[neighbor_index] == UNREACHABLE:
+                continue
+            neighbor = grid.cell(neighbor_index)
+            own_from[neighbor_index] = index
+            own_g[neighbor_index] = tentative_g_score
+            f_score = tentative_g_score + own_h[neighbor_index]
+            if neighbor_index in open_list:
+                open_list.decrease_key(neighbor_index, (f_score, -tentative_g_score, neighbor))
+            else:
+                open_list.push(neighbor_index, (f_score, -tentative_g_score, neighbor))
+            if observer:
+                observer("generate", neighbor)
+
+    if meeting is None:
+        return [], node_count, [], visited, steps
+    full_path = reconstruct_path(came_from[0], meeting[0], grid)
+    index = meeting[1]
+    if index != meeting[0]:
+        while index != -1:
+            full_path.append(grid.cell(index))
+            index = came_from[1][index]
+    if observer:
+        observer("goal", goals[0])
     directions = convert_path_to_directions(full_path)
     return full_path, node_count, directions, visited, steps
 
-def iddfs(marker, goals, walls, rows, cols, canvas, cell_size, find_multiple_paths=False):
+def iddfs(marker, goals, walls, rows, cols, find_multiple_paths=False, observer=None, max_depth=None):
+    """Iterative deepening DFS that resumes from the previous depth limit.
+
+    Every cell is labelled with the smallest depth it has been reached at (a
+    depth-indexed visited map), and is expanded again only when a shorter
+    route to it turns up. Children that fall just past the current limit are
+    kept as the frontier of the next iteration instead of being regenerated
+    from the start, so an iteration only pays for the cells that became
+    reachable at the new depth. The depth cap defaults to the number of cells
+    in the grid, the length of the longest possible path.
+    """
+    if find_multiple_paths:
+        return _solve_tour("CUS1", marker, goals, walls, rows, cols, observer, max_depth=max_depth)
+    grid = as_grid(walls, rows, cols)
+    goals = grid.reachable_goals(marker, goals)  # Drop walled-off goals up front, see Grid.components
+    if max_depth is None:
+        max_depth = grid.size
     remaining_goals = set(goals)
     steps = []
-    full_path = []
     node_count = 0
-    directions = []
     iterations = 0  # Track the number of iterations
+    if not remaining_goals:
+        return [], node_count, [], array('i'), steps, iterations
+
+    start = grid.index(marker)
+    depth = array('i', [UNREACHED]) * grid.size
+    parent = array('i', [-1]) * grid.size
+    depth[start] = 0
+    frontier = array('i', [start])  # Cells reached exactly one level past the last limit
+    goal_index = -1
+    if observer:
+        observer("start", marker)
+
+    for limit in range(max_depth + 1):
+        iterations += 1  # Increment iteration count
+        # (cell index, depth) pairs, seeded with the frontier cells still at this depth
+        stack = array('i')
+        for index in reversed(frontier):
+            if depth[index] == limit:
+                stack.extend((index, limit))
+        frontier = array('i')
 
-    # Run IDDFS for each goal independently if find_multiple_paths is True
-    while remaining_goals:
-        for depth in range(0, 1000):  # Arbitrary depth limit, can be adjusted
-            iterations += 1  # Increment iteration count
-            # Perform Depth-Limited Search (DLS) for the current starting point
-            path, new_directions, new_steps, found_goals, highlighted_nodes = dls(
-                marker, remaining_goals, walls, rows, cols, depth, canvas, cell_size, find_multiple_paths
-            )
-            steps.extend(new_steps)  # Record steps for visualization
-
-            # Clear highlighted nodes after each depth iteration
-            for node_id in highlighted_nodes:
-                canvas.delete(node_id)
-            
-            if path:
-                # Append path and directions to the final results
-                if full_path and full_path[-1] == path[0]:
-                    full_path.extend(path[1:])  # Avoid duplicating starting point
-                else:
-                    full_path.extend(path)
-                directions.extend(new_directions)
-                node_count += len(new_steps)
-
-                # Remove the found goal from remaining_goals
-                remaining_goals.difference_update(found_goals)
-                marker = path[-1]  # Update marker to new starting point (last goal found)
-                
-                break  # Restart IDDFS for the next goal if found
-
-        # Exit if no remaining goals or only looking for a single path
-        if not find_multiple_paths or not remaining_goals:
-            break
+        while stack:
+            current_depth = stack.pop()
+            index = stack.pop()
+            if depth[index] != current_depth:
+                continue  # Superseded by a shorter route found later
+            current = grid.cell(index)
+            node_count += 1
+            steps.append(('move', current))
+            if observer:
+                observer("visit", current)
 
-    return full_path, node_count, directions, {}, steps, iterations  # Return the accumulated path, count, directions, etc.
+            # Check if current node is a goal
+            if current in remaining_goals:
+                goal_index = index
+                break
 
-def dls(node, goals, walls, rows, cols, depth_limit, canvas, cell_size, find_multiple_paths):
-    stack = [(node, [node], 0)]
-    visited = set()
+            # Expand neighbors, deferring those past the depth limit to the next iteration
+            child_depth = current_depth + 1
+            for neighbor in grid.neighbor_indices(index):
+                if child_depth < depth[neighbor]:
+                    depth[neighbor] = child_depth
+                    parent[neighbor] = index
+                    if child_depth <= limit:
+                        stack.extend((neighbor, child_depth))
+                    else:
+                        frontier.append(neighbor)
+                    if observer:
+                        observer("generate", grid.cell(neighbor))
+
+        if goal_index != -1 or not frontier:
+            break  # Goal found, or nothing is left to reach at a greater depth
+
+    if goal_index == -1:
+        return [], node_count, [], depth, steps, iterations  # The goals are out of reach
+    full_path = reconstruct_path(parent, goal_index, grid)
+    if observer:
+        observer("goal", full_path[-1])
+    directions = convert_path_to_directions(full_path)
+    return full_path, node_count, directions, depth, steps, iterations
+
+def dls(node, goals, walls, rows, cols, depth_limit, find_multiple_paths=False, observer=None):
+    grid = as_grid(walls, rows, cols)
+    # The stack holds (cell index, parent index, depth) triples flattened into one int array
+    stack = array('i', (grid.index(node), -1, 0))
+    visited = bytearray(grid.size)
+    parent = array('i', [-1]) * grid.size
     steps = []
     remaining_goals = set(goals)
-    highlighted_nodes = []
-    yellow_square = create_yellow_square(canvas, node[0], node[1], cell_size)
+    if observer:
+        observer("start", node)
 
     while stack:
-        current, path, depth = stack.pop()
+        depth = stack.pop()
+        from_index = stack.pop()
+        index = stack.pop()
 
         # Skip if node is visited or depth exceeds the limit
-        if current in visited or depth > depth_limit:
+        if visited[index] or depth > depth_limit:
             continue
-        visited.add(current)
+        visited[index] = 1
+        parent[index] = from_index
+        current = grid.cell(index)
         steps.append(('move', current))
-
-        # Highlight the current node as visited and move the yellow square
-        rect_id = canvas.create_rectangle(
-            current[0] * cell_size, current[1] * cell_size,
-            (current[0] + 1) * cell_size, (current[1] + 1) * cell_size,
-            fill="lightgray", outline="black"
-        )
-        highlighted_nodes.append(rect_id)
-        move_yellow_square(canvas, yellow_square, current[0], current[1], cell_size)
-        canvas.update()
-        time.sleep(0.05)
-
+        if observer:
+            observer("visit", current)
 
         # Check if current node is a goal
         if current in remaining_goals:
             remaining_goals.remove(current)
+            path = reconstruct_path(parent, index, grid)
             directions = convert_path_to_directions(path)
-            canvas.delete(yellow_square)
-            return path, directions, steps, {current}, highlighted_nodes  # Return when a goal is reached
+            if observer:
+                observer("goal", current)
+            return path, directions, steps, {current}  # Return when a goal is reached
 
         # Expand neighbors up to depth limit
-        neighbors = get_neighbors(current, walls, rows, cols)
-        for neighbor in neighbors:
-            if neighbor not in visited:
-                stack.append((neighbor, path + [neighbor], depth + 1))
-                # Highlight expanded node in light green
-                rect_id = canvas.create_rectangle(
-                    neighbor[0] * cell_size, neighbor[1] * cell_size,
-                    (neighbor[0] + 1) * cell_size, (neighbor[1] + 1) * cell_size,
-                    fill="lightgreen", outline="black"
-                )
-                highlighted_nodes.append(rect_id)
-                canvas.update()
-                time.sleep(0.05)
-
-
-    # Clean up and return if no goal was found within depth limit
-    canvas.delete(yellow_square)
-    return None, None, steps, remaining_goals, highlighted_nodes  # Goal not found within depth limit
-
-def ida_star(marker, goals, walls, rows, cols, canvas, cell_size, find_multiple_paths=False):
-    def search(path, g, bound):
-        nonlocal iterations
-        iterations += 1  # Increment iteration count for each recursive call
-        current = path[-1]
-        f = g + min(manhattan_distance(current, goal) for goal in remaining_goals)
-        if f > bound:
-            return f, None
-        if current in remaining_goals:
-            return g, path
-        min_bound = float('inf')
-        for neighbor in get_neighbors(current, walls, rows, cols):
-            if neighbor not in path:
+        for neighbor in grid.neighbor_indices(index):
+            if not visited[neighbor]:
+                stack.extend((neighbor, index, depth + 1))
+                if observer:
+                    observer("generate", grid.cell(neighbor))
+
+    return None, None, steps, remaining_goals  # Goal not found within depth limit
+
+def ida_star(marker, goals, walls, rows, cols, find_multiple_paths=False, observer=None,
+             transposition_limit=TRANSPOSITION_LIMIT, heuristic="manhattan"):
+    """Iterative deepening A* with an explicit stack.
+
+    Each iteration runs a depth-first search bounded by f = g + h. Cells on the
+    current path are tracked in a byte array. A transposition table, capped at
+    transposition_limit entries (0 disables it), prunes cells already reached
+    at an equal or lower g in the same iteration. The fourth element of the
+    result lists the nodes expanded in every bound iteration.
+    """
+    if find_multiple_paths:
+        return _solve_tour("CUS2", marker, goals, walls, rows, cols, observer,
+                           transposition_limit=transposition_limit, heuristic=heuristic)
+    grid = as_grid(walls, rows, cols)
+    goals = grid.reachable_goals(marker, goals)  # Drop walled-off goals up front, see Grid.components
+    on_path = bytearray(grid.size)
+    remaining_goals = set(goals)
+    # Precomputed distance to the nearest goal, see heuristic.HeuristicField
+    h = heuristic_field(heuristic, grid, goals).values
+
+    def search(start, bound):
+        """One bounded iteration: return (goal path or None, smallest f over the bound, expansions)."""
+        table = {} if transposition_limit else None
+        next_bound = INFINITY
+        path = [start]
+        on_path[start] = 1
+        expansions = 1
+        if observer:
+            observer("visit", grid.cell(start))
+        frames = [iter(grid.neighbor_indices(start))]
+
+        while frames:
+            g = len(path)  # g-score of the children of the last path cell
+            for neighbor in frames[-1]:
+                if on_path[neighbor]:
+                    continue
+                if table is not None:
+                    seen = table.get(neighbor)
+                    if seen is not None and seen <= g:
+                        continue
+                    if seen is not None or len(table) < transposition_limit:
+                        table[neighbor] = g
+                if h[neighbor] == UNREACHABLE:
+                    continue  # No remaining goal can be reached from this cell
+                f = g + h[neighbor]
+                if f > bound:
+                    next_bound = min(next_bound, f)
+                    continue
                 path.append(neighbor)
-                t, result = search(path, g + 1, bound)
-                if result:
-                    return t, result
-                if t < min_bound:
-                    min_bound = t
-                path.pop()
-        return min_bound, None
+                on_path[neighbor] = 1
+                cell = grid.cell(neighbor)
+                if observer:
+                    observer("generate", cell)
+                if cell in remaining_goals:
+                    for index in path:
+                        on_path[index] = 0
+                    return path, bound, expansions
+                expansions += 1
+                if observer:
+                    observer("visit", cell)
+                frames.append(iter(grid.neighbor_indices(neighbor)))
+                break
+            else:
+                # Every child of the last path cell is done: backtrack
+                frames.pop()
+                on_path[path.pop()] = 0
+        return None, next_bound, expansions
 
-    full_path = []
     node_count = 0
     steps = []
-    directions = []
-    iterations = 0  # Track the number of iterations
-    bound = min(manhattan_distance(marker, goal) for goal in goals)
-    yellow_square = create_yellow_square(canvas, marker[0], marker[1], cell_size)
-    highlighted_nodes = []
-    remaining_goals = set(goals)
-    
-    while remaining_goals:
-        path = [marker]
-        t, result = search(path, 0, bound)
-        if result:
-            full_path.extend(result)
-            if result[-1] in remaining_goals:  # Check if the goal is in remaining_goals
-                remaining_goals.remove(result[-1])
-            directions.extend(convert_path_to_directions(result))
-            node_count += len(result)
-            marker = result[-1]  # Reset starting point to the last goal found
-
-            # Highlight the path to the current goal
-            for node in result:
-                rect_id = canvas.create_rectangle(
-                    node[0] * cell_size, node[1] * cell_size,
-                    (node[0] + 1) * cell_size, (node[1] + 1) * cell_size,
-                    fill="lightgray", outline="black"
-                )
-                highlighted_nodes.append(rect_id)
-                move_yellow_square(canvas, yellow_square, node[0], node[1], cell_size)
-            canvas.update()
-            time.sleep(0.05)
-
-            if not find_multiple_paths:
-                break  # Stop after finding the first goal if not finding multiple paths
-            if iterations > 1000:
-                break
-        else:
-            bound = t
-
+    expansions_per_iteration = []
+    iterations = 0
+    start = grid.index(marker)
+    if not remaining_goals:
+        return [], node_count, [], expansions_per_iteration, steps, iterations
+
+    if observer:
+        observer("start", marker)
+    if marker in remaining_goals:
+        goal_path = [start]
+    else:
+        goal_path = None
+        bound = h[start] if h[start] != UNREACHABLE else INFINITY
+        while goal_path is None and bound != INFINITY:
+            iterations += 1
+            goal_path, bound, expansions = search(start, bound)
+            node_count += expansions
+            expansions_per_iteration.append(expansions)
+            if observer and goal_path is None:
+                observer("reset", marker)
+    if goal_path is None:
+        return [], node_count, [], expansions_per_iteration, steps, iterations  # The goals are out of reach
+
+    full_path = [grid.cell(index) for index in goal_path]
+    if observer:
+        observer("goal", full_path[-1])
     directions = convert_path_to_directions(full_path)
-    return full_path, node_count, directions, {}, steps, iterations
+    return full_path, node_count, directions, expansions_per_iteration, steps, iterations
+
+
+# Strategy registry used by the GUI and the command line
+STRATEGIES = {
+    "DFS": dfs,
+    "BFS": bfs,
+    "GBFS": gbfs,
+    "AS": a_star,
+    "JPS": jps,
+    "BBFS": bidirectional_bfs,
+    "BAS": bidirectional_a_star,
+    "CUS1": iddfs,
+    "CUS2": ida_star
+}
+
+# Dictionary to map method abbreviations to full names
+METHOD_NAMES = {
+    "DFS": "Depth-First Search",
+    "BFS": "Breadth-First Search",
+    "GBFS": "Greedy Best-First Search",
+    "AS": "A* Search",
+    "JPS": "Jump Point Search",
+    "BBFS": "Bidirectional Breadth-First Search",
+    "BAS": "Bidirectional A* Search",
+    "CUS1": "Iterative Deepening Depth-First Search",
+    "CUS2": "Iterative Deepening A* Search"
+}
+
+# Methods whose result tuple carries an iteration count as its sixth element
+ITERATIVE_METHODS = {"CUS1", "CUS2"}
+
+# Methods whose open list is built through their heap= option
+HEAP_METHODS = {"GBFS", "AS", "JPS", "BAS"}
+
+
+def solve(method, marker, goals, walls, rows, cols, find_multiple_paths=False, observer=None, **options):
+    """Run the strategy registered under method without any GUI attached.
+
+    Extra keyword options, such as heuristic= or heap=, are passed on to the strategy.
+    """
+    try:
+        strategy = STRATEGIES[method]
+    except KeyError:
+        raise ValueError(f"Method '{method}' not supported.") from None
+    return strategy(marker, goals, walls, rows, cols, find_multiple_paths, observer, **options)
+
+
+def _solve_tour(method, marker, goals, walls, rows, cols, observer, **options):
+    """Multi-goal runs of the single-goal searches visit the goals in planned tour order."""
+    from tour import solve_tour  # tour imports this module
+    return solve_tour(method, marker, goals, walls, rows, cols, observer, **options)
+
+
+def format_result(result, method, goals, find_multiple_paths=False, input_file=None):
+    """Build the report lines shown after a search, or None if no path was found."""
+    if not result or not (find_multiple_paths or goals[0] in result[0]):
+        return None
+    node_count, directions = result[1], result[2]
+    lines = [
+        f"Selected Map Input: {input_file}",
+        f"Search Strategy: {METHOD_NAMES.get(method, method)}"
+    ]
+    if find_multiple_paths:
+        # List goals in the order the path reaches them
+        remaining = set(goals)
+        found = []
+        for cell in result[0]:
+            if cell in remaining:
+                remaining.remove(cell)
+                found.append(cell)
+        lines.append(f"Goals Found: {', '.join(map(str, found))}")
+    else:
+        lines.append(f"Goal Found: {goals[0]}")
+    if method in ITERATIVE_METHODS:
+        lines.append(f"Number of Iterations: {result[5]}")
+    lines.append(f"Number of Nodes Visited: {node_count}")
+    lines.append(f"Path to Goal(s): {', '.join(directions)}")
+    return lines
 
 
 # Helper Functions
-def reconstruct_path(came_from, current):
-    """Reconstruct the path from start to the current position."""
+def reconstruct_path(came_from, current, grid=None):
+    """Reconstruct the path from start to the current position.
+
+    With a grid, came_from is a parent array of flat cell indices (-1 marks the
+    start) and current is the flat index of the last cell.
+    """
+    if grid is not None:
+        path = []
+        while current != -1:
+            path.append(grid.cell(current))
+            current = came_from[current]
+        path.reverse()
+        return path
     path = []
     while current:
         path.append(current)
@@ -503,6 +825,19 @@ def reconstruct_path(came_from, current):
     path.reverse()
     return path
 
+def interpolate_path(points):
+    """Fill in the cells between consecutive points that share a row or column."""
+    path = points[:1]
+    for col, row in points[1:]:
+        last_col, last_row = path[-1]
+        step_col = (col > last_col) - (col < last_col)
+        step_row = (row > last_row) - (row < last_row)
+        while (last_col, last_row) != (col, row):
+            last_col += step_col
+            last_row += step_row
+            path.append((last_col, last_row))
+    return path
+
 def convert_path_to_directions(path):
     """Convert a path to human-readable directions (up, down, left, right)."""
     directions = []
@@ -527,6 +862,8 @@ def manhattan_distance(node, goal):
 
 def get_neighbors(cell, walls, rows, cols):
     """Get valid neighbors of a cell (UP, LEFT, DOWN, RIGHT) that are not walls."""
+    if isinstance(walls, Grid):
+        return walls.neighbors(cell)
     col, row = cell
     neighbors = []
     if col < cols - 1 and (col + 1, row) not in walls:
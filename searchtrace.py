@@ -0,0 +1,142 @@
+import struct
+import sys
+from array import array
+from compiledmap import pack_cells, unpack_cells
+from gridmap import Grid, as_grid
+from searchstrategy import convert_path_to_directions, solve
+from tour import solve_tour
+
+# Observer events in the order of their one-byte codes
+EVENTS = ("start", "visit", "generate", "goal", "reset")
+EVENT_CODES = {event: code for code, event in enumerate(EVENTS)}
+
+MAGIC = b"GTRC"
+FORMAT_VERSION = 1
+MULTIPLE = 1         # Flag: the trace is a find_multiple_paths tour
+HAS_ITERATIONS = 2   # Flag: the strategy reported an iteration count
+
+# magic, format version, flags, method, rows, cols, marker col, marker row, goal count,
+# path length, node count, iterations, event count
+HEADER = struct.Struct("<4sHH8sIIIIIIqqQ")
+
+
+class Trace:
+    """Observer that records a search as compact typed arrays for later replay.
+
+    Each event is one byte in events (its code in EVENTS) and one flat cell
+    index in cells, so recording costs two appends per event and a trace of
+    a million events takes 5 MB. record() also keeps the map and the result
+    so save() writes a file that can be replayed without the source map.
+    Events are passed on to observer, if given, after they are recorded.
+    """
+
+    def __init__(self, rows, cols, observer=None):
+        self.observer = observer
+        self.rows = rows
+        self.cols = cols
+        self.events = bytearray()
+        self.cells = array('i')
+        self.method = None
+        self.marker = None
+        self.goals = []
+        self.grid = None
+        self.find_multiple_paths = False
+        self.result = None
+
+    def __call__(self, event, cell):
+        self.events.append(EVENT_CODES[event])
+        self.cells.append(cell[1] * self.cols + cell[0])
+        if self.observer:
+            self.observer(event, cell)
+
+    def __len__(self):
+        return len(self.events)
+
+    def __bool__(self):
+        return True  # Strategies test `if observer:`, which must hold for an empty trace too
+
+    def __getitem__(self, position):
+        """(event, (col, row)) of the event at position."""
+        row, col = divmod(self.cells[position], self.cols)
+        return EVENTS[self.events[position]], (col, row)
+
+    def save(self, path):
+        """Write the trace, its map and its result to path."""
+        path_cells, node_count = self.result[0], self.result[1]
+        flags = MULTIPLE if self.find_multiple_paths else 0
+        iterations = 0
+        if len(self.result) > 5:
+            flags |= HAS_ITERATIONS
+            iterations = self.result[5]
+        header = HEADER.pack(MAGIC, FORMAT_VERSION, flags, self.method.encode()[:8], self.rows, self.cols,
+                             self.marker[0], self.marker[1], len(self.goals), len(path_cells),
+                             node_count, iterations, len(self.events))
+        cells = self.cells
+        indices = array('i', (row * self.cols + col for col, row in list(self.goals) + list(path_cells)))
+        if sys.byteorder != "little":
+            cells, indices = array('i', cells), array('i', indices)
+            cells.byteswap()
+            indices.byteswap()
+        with open(path, "wb") as file:
+            file.write(header)
+            file.write(indices.tobytes())
+            file.write(pack_cells(self.grid.cells))
+            file.write(self.events)
+            file.write(cells.tobytes())
+
+
+def record(method, marker, goals, walls, rows, cols, find_multiple_paths=False, observer=None):
+    """Run a search at full speed with a Trace attached and return (result, trace)."""
+    grid = as_grid(walls, rows, cols)
+    trace = Trace(rows, cols, observer)
+    if find_multiple_paths:
+        result = solve_tour(method, marker, goals, grid, rows, cols, trace)
+    else:
+        result = solve(method, marker, goals, grid, rows, cols, False, trace)
+    trace.method = method
+    trace.marker = marker
+    trace.goals = list(goals)
+    trace.grid = grid
+    trace.find_multiple_paths = find_multiple_paths
+    trace.result = result
+    return result, trace
+
+
+def load_trace(path):
+    """Read a trace written by Trace.save(); raises ValueError if it is not one."""
+    with open(path, "rb") as file:
+        data = file.read()
+    if len(data) < HEADER.size or data[:len(MAGIC)] != MAGIC:
+        raise ValueError(f"{path}: not a search trace")
+    (_, version, flags, method, rows, cols, marker_col, marker_row, goal_count, path_length,
+     node_count, iterations, event_count) = HEADER.unpack_from(data, 0)
+    if version != FORMAT_VERSION:
+        raise ValueError(f"{path}: trace format {version} is not supported")
+
+    def take(size):
+        nonlocal offset
+        offset += size
+        return data[offset - size:offset]
+
+    offset = HEADER.size
+    indices = array('i', take(4 * (goal_count + path_length)))
+    grid = Grid(rows, cols)
+    grid.cells[:] = unpack_cells(take((rows * cols + 7) // 8), rows * cols)
+    grid.mark_changed()
+    trace = Trace(rows, cols)
+    trace.events = bytearray(take(event_count))
+    trace.cells = array('i', take(4 * event_count))
+    if sys.byteorder != "little":
+        indices.byteswap()
+        trace.cells.byteswap()
+    points = [grid.cell(index) for index in indices]
+    path_cells = points[goal_count:]
+    trace.method = method.rstrip(b"\0").decode()
+    trace.marker = marker_col, marker_row
+    trace.goals = points[:goal_count]
+    trace.grid = grid
+    trace.find_multiple_paths = bool(flags & MULTIPLE)
+    trace.result = (path_cells, node_count, convert_path_to_directions(path_cells), None, [])
+    if flags & HAS_ITERATIONS:
+        trace.result += (iterations,)
+    return trace
@@ -0,0 +1,87 @@
+import queue
+import threading
+import time
+from searchtrace import record
+
+# Seconds between progress messages from a running search
+PROGRESS_INTERVAL = 0.1
+
+
+class SearchCancelled(Exception):
+    """Raised inside a search's observer to stop it once cancel() has been called."""
+
+
+class SearchWorker:
+    """Runs recorded searches on a background thread and reports through a thread-safe queue.
+
+    start() launches a search, poll() returns the messages posted since the
+    last call, each a (kind, payload) pair:
+      ("progress", (nodes expanded, seconds elapsed))  about every PROGRESS_INTERVAL
+      ("done", (result, trace, seconds elapsed))
+      ("cancelled", None)
+      ("error", exception)
+    Every run is numbered and poll() drops messages from superseded runs, so
+    starting another search never mixes its reports with the old one's.
+    The search checks for cancellation at every observer event.
+    """
+
+    def __init__(self):
+        self.messages = queue.Queue()
+        self.run_id = 0
+        self._cancel = threading.Event()
+        self._thread = None
+
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, method, marker, goals, walls, rows, cols, find_multiple_paths=False):
+        """Cancel any running search and start method in the background."""
+        self.cancel()
+        self.run_id += 1
+        self._cancel = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True,
+                                        args=(self.run_id, self._cancel,
+                                              (method, marker, goals, walls, rows, cols, find_multiple_paths)))
+        self._thread.start()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def poll(self):
+        """Messages of the current run posted since the last poll, oldest first."""
+        messages = []
+        while True:
+            try:
+                run_id, kind, payload = self.messages.get_nowait()
+            except queue.Empty:
+                return messages
+            if run_id == self.run_id:
+                messages.append((kind, payload))
+
+    def _run(self, run_id, cancel, args):
+        post = self.messages.put
+        start = time.perf_counter()
+        nodes = 0
+        next_report = start + PROGRESS_INTERVAL
+
+        def progress(event, cell):
+            nonlocal nodes, next_report
+            if cancel.is_set():
+                raise SearchCancelled
+            if event == "visit":
+                nodes += 1
+                # Read the clock only every 256 nodes, it costs more than the rest of the observer
+                if not nodes & 255:
+                    now = time.perf_counter()
+                    if now >= next_report:
+                        post((run_id, "progress", (nodes, now - start)))
+                        next_report = now + PROGRESS_INTERVAL
+
+        try:
+            result, trace = record(*args, observer=progress)
+        except SearchCancelled:
+            post((run_id, "cancelled", None))
+        except Exception as e:
+            post((run_id, "error", e))
+        else:
+            post((run_id, "done", (result, trace, time.perf_counter() - start)))
@@ -0,0 +1,278 @@
+import argparse
+import json
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import OrderedDict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from compiledmap import load_map
+from distcache import DEFAULT_BUDGET, DistanceCache
+from mapparser import MapParseError
+from searchstrategy import STRATEGIES, solve
+from tour import solve_tour
+
+DEFAULT_PORT = 8765
+
+# Parsed maps kept in memory by default
+DEFAULT_MAPS = 16
+
+# Method name answered from cached BFS distance fields (distcache) instead of a strategy
+FIELD_METHOD = "FIELD"
+
+# Latencies kept per endpoint for the percentiles in /metrics
+LATENCY_WINDOW = 1000
+
+
+class MapCache:
+    """LRU of parsed maps keyed by real path, reloaded when the file's mtime or size changes."""
+
+    def __init__(self, capacity=DEFAULT_MAPS):
+        self.capacity = capacity
+        self.maps = OrderedDict()  # real path -> ((mtime, size), (rows, cols, marker, goals, grid))
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get(self, path):
+        """(rows, cols, marker, goals, Grid) of the map at path, parsing it on a miss."""
+        key = os.path.realpath(path)
+        stat = os.stat(key)
+        stamp = stat.st_mtime_ns, stat.st_size
+        with self.lock:
+            entry = self.maps.get(key)
+            if entry is not None and entry[0] == stamp:
+                self.maps.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        # Parse outside the lock so other queries keep running; two racing misses just parse twice
+        loaded = load_map(key)
+        loaded[4].components()  # Label components now, not concurrently inside the searches
+        with self.lock:
+            self.maps[key] = stamp, loaded
+            self.maps.move_to_end(key)
+            while len(self.maps) > self.capacity:
+                self.maps.popitem(last=False)
+        return loaded
+
+
+class Metrics:
+    """Request counts, errors and latency percentiles per endpoint."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self.endpoints = {}  # path -> {"count", "errors", "total", "latencies"}
+
+    def record(self, endpoint, seconds, error=False):
+        with self.lock:
+            entry = self.endpoints.setdefault(endpoint, {"count": 0, "errors": 0, "total": 0.0,
+                                                         "latencies": deque(maxlen=LATENCY_WINDOW)})
+            entry["count"] += 1
+            entry["errors"] += error
+            entry["total"] += seconds
+            entry["latencies"].append(seconds)
+
+    def snapshot(self):
+        with self.lock:
+            report = {}
+            for endpoint, entry in self.endpoints.items():
+                latencies = sorted(entry["latencies"])
+                report[endpoint] = {
+                    "count": entry["count"],
+                    "errors": entry["errors"],
+                    "mean_ms": round(entry["total"] / entry["count"] * 1000, 3),
+                    "p50_ms": round(latencies[len(latencies) // 2] * 1000, 3),
+                    "p95_ms": round(latencies[min(len(latencies) - 1, len(latencies) * 95 // 100)] * 1000, 3),
+                    "max_ms": round(latencies[-1] * 1000, 3),
+                }
+            return report
+
+
+class SolverService:
+    """Answers path queries on maps kept warm in memory; shared by all request threads.
+
+    A query names a map file and a method, and may override the marker and
+    goals of the map. The strategies only read the cached Grid, so queries
+    run concurrently. Method FIELD answers single-goal queries from BFS
+    distance fields kept in a distcache.DistanceCache, the fastest option
+    for repeated queries towards the same goals. Multi-goal tours are planned
+    from the same cache.
+    """
+
+    def __init__(self, max_maps=DEFAULT_MAPS, field_budget=DEFAULT_BUDGET):
+        self.maps = MapCache(max_maps)
+        self.fields = DistanceCache(field_budget)  # Thread-safe, shared by FIELD queries and tour plans
+        self.metrics = Metrics()
+
+    def solve(self, query):
+        """Answer a {"map", "method", "multiple", "marker", "goals"} query with a JSON-ready dict."""
+        try:
+            path = query["map"]
+        except KeyError:
+            raise ValueError("the query needs a 'map' file") from None
+        method = str(query.get("method", "AS")).upper()
+        find_multiple_paths = bool(query.get("multiple", False))
+        if method not in STRATEGIES and method != FIELD_METHOD:
+            raise ValueError(f"Method '{method}' not supported.")
+        rows, cols, marker, goals, grid = self.maps.get(path)
+        if "marker" in query:
+            marker = tuple(query["marker"])
+        if "goals" in query:
+            goals = [tuple(goal) for goal in query["goals"]]
+        if not goals:
+            raise ValueError("the query needs at least one goal")
+        for cell in [marker] + goals:
+            if not grid.in_bounds(cell):
+                raise ValueError(f"{cell} is outside the {rows}x{cols} grid")
+
+        start = time.perf_counter()
+        if method == FIELD_METHOD:
+            if find_multiple_paths:
+                raise ValueError(f"{FIELD_METHOD} answers single-goal queries only")
+            result = self.fields.solve(marker, goals, grid)
+        elif find_multiple_paths:
+            result = solve_tour(method, marker, goals, grid, rows, cols, cache=self.fields)
+        else:
+            result = solve(method, marker, goals, grid, rows, cols)
+        goal_set = set(goals)
+        found = [cell for cell in result[0] if cell in goal_set]
+        return {
+            "method": method,
+            "found": bool(found),
+            "goal": list(found[-1]) if found else None,
+            "path": [list(cell) for cell in result[0]],
+            "directions": result[2],
+            "node_count": result[1],
+            "search_ms": round((time.perf_counter() - start) * 1000, 3),
+        }
+
+    def report(self):
+        """Everything /metrics returns."""
+        return {
+            "uptime_s": round(time.time() - self.metrics.started, 1),
+            "requests": self.metrics.snapshot(),
+            "map_cache": {"maps": len(self.maps.maps), "hits": self.maps.hits, "misses": self.maps.misses},
+            "field_cache": {"fields": len(self.fields), "memory": self.fields.memory, "hits": self.fields.hits,
+                            "misses": self.fields.misses, "evictions": self.fields.evictions},
+        }
+
+
+class SolverHandler(BaseHTTPRequestHandler):
+    """POST /solve with a JSON query, GET /metrics and GET /health."""
+    service = None  # SolverService, set by make_server
+    quiet = True
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._timed(lambda: {"status": "ok"})
+        elif self.path == "/metrics":
+            self._timed(self.service.report, record=False)
+        else:
+            self._send(404, {"error": f"unknown path {self.path}"})
+
+    def do_POST(self):
+        if self.path != "/solve":
+            self._send(404, {"error": f"unknown path {self.path}"})
+            return
+
+        def answer():
+            length = int(self.headers.get("Content-Length", 0))
+            return self.service.solve(json.loads(self.rfile.read(length) or b"{}"))
+
+        self._timed(answer)
+
+    def _timed(self, answer, record=True):
+        start = time.perf_counter()
+        status = 200
+        try:
+            body = answer()
+        except FileNotFoundError as e:
+            status, body = 404, {"error": f"map not found: {e.filename}"}
+        except (ValueError, TypeError, MapParseError, OSError) as e:
+            status, body = 400, {"error": str(e)}
+        except Exception as e:
+            status, body = 500, {"error": f"{type(e).__name__}: {e}"}
+        self._send(status, body)
+        if record:
+            self.service.metrics.record(self.path, time.perf_counter() - start, status != 200)
+
+    def _send(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+
+def make_server(host="127.0.0.1", port=DEFAULT_PORT, service=None, quiet=True):
+    """HTTP server answering queries with service (a new SolverService by default); port 0 picks a free one."""
+    handler = type("Handler", (SolverHandler,), {"service": service or SolverService(), "quiet": quiet})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+class SolverClient:
+    """Minimal client for a running service, for tests and scripts."""
+
+    def __init__(self, host="127.0.0.1", port=DEFAULT_PORT, timeout=60):
+        self.url = f"http://{host}:{port}"
+        self.timeout = timeout
+
+    def _request(self, path, query=None):
+        data = json.dumps(query).encode() if query is not None else None
+        request = urllib.request.Request(self.url + path, data=data, headers={"Content-Type": "application/json"})
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            raise ValueError(json.loads(e.read()).get("error", str(e))) from None
+
+    def solve(self, input_file, method="AS", find_multiple_paths=False, marker=None, goals=None):
+        query = {"map": input_file, "method": method, "multiple": find_multiple_paths}
+        if marker is not None:
+            query["marker"] = list(marker)
+        if goals is not None:
+            query["goals"] = [list(goal) for goal in goals]
+        return self._request("/solve", query)
+
+    def metrics(self):
+        return self._request("/metrics")
+
+    def health(self):
+        return self._request("/health")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="script.py serve",
+                                     description="Serve path queries over HTTP on localhost with maps kept in memory.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--maps", type=int, default=DEFAULT_MAPS, help="parsed maps kept in memory")
+    parser.add_argument("--field-mb", type=float, default=DEFAULT_BUDGET / 2 ** 20,
+                        help="memory budget of the cached distance fields, in MiB")
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    args = parser.parse_args(argv)
+
+    service = SolverService(args.maps, int(args.field_mb * 2 ** 20))
+    server = make_server(args.host, args.port, service, quiet=not args.verbose)
+    host, port = server.server_address[:2]
+    print(f"Serving on http://{host}:{port} (POST /solve, GET /metrics, GET /health)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+import random
+import pytest
+import mapgen
+from conftest import assert_valid_path
+from dstar import DStarLite
+from searchstrategy import bfs
+
+SIZE = 30
+
+
+def check_plan(planner):
+    """The planner's path must be as short as a fresh BFS on the same grid."""
+    grid = planner.grid
+    start, goal = grid.cell(planner.start), grid.cell(planner.goal)
+    expected = bfs(start, [goal], grid, grid.rows, grid.cols)[0] if grid.is_passable(start) else []
+    path = planner.path()
+    if not expected:
+        assert path == [] and planner.path_length() is None
+        return
+    assert planner.path_length() == len(expected) - 1
+    assert_valid_path(grid, path, start, goal)
+    assert len(path) == len(expected)
+
+
+@pytest.mark.parametrize("family", mapgen.FAMILIES)
+def test_replans_match_fresh_bfs(family):
+    rng = random.Random(family)
+    spec = mapgen.generate(family, SIZE, SIZE, 3)
+    planner = DStarLite(spec.marker, spec.goals[0], spec.grid(), SIZE, SIZE)
+    check_plan(planner)
+    for _ in range(60):
+        x, y = rng.randrange(SIZE), rng.randrange(SIZE)
+        width, height = rng.randint(1, 3), rng.randint(1, 3)
+        # Keep the goal open, a walled goal has no plan to repair
+        goal_col, goal_row = planner.grid.cell(planner.goal)
+        if x <= goal_col < x + width and y <= goal_row < y + height:
+            continue
+        if rng.random() < 0.6:
+            planner.add_wall(x, y, width, height)
+        else:
+            planner.remove_wall(x, y, width, height)
+        check_plan(planner)
+        # Sometimes take a step along the current path
+        path = planner.path()
+        if len(path) > 1 and rng.random() < 0.5:
+            planner.move_to(path[1])
+            check_plan(planner)
@@ -0,0 +1,49 @@
+import random
+import pytest
+import mapgen
+from conftest import assert_valid_path
+from hpa import HierarchicalMap
+from searchstrategy import bfs
+
+SIZE = 40
+CLUSTER_SIZE = 8
+
+
+def random_edit(hmap, rng):
+    edit = hmap.add_wall if rng.random() < 0.6 else hmap.remove_wall
+    edit(rng.randrange(SIZE), rng.randrange(SIZE), rng.randint(1, 4), rng.randint(1, 4))
+
+
+def random_cell(rng):
+    return rng.randrange(SIZE), rng.randrange(SIZE)
+
+
+@pytest.mark.parametrize("family", mapgen.FAMILIES)
+def test_local_rebuild_matches_fresh_build(family):
+    rng = random.Random(family)
+    grid = mapgen.generate(family, SIZE, SIZE, 1).grid()
+    hmap = HierarchicalMap(grid, CLUSTER_SIZE)
+    for _ in range(30):
+        random_edit(hmap, rng)
+        fresh = HierarchicalMap(grid, CLUSTER_SIZE)
+        assert hmap.borders == fresh.borders
+        assert hmap.inter == fresh.inter
+        assert hmap.intra == fresh.intra
+
+
+@pytest.mark.parametrize("family", mapgen.FAMILIES)
+def test_paths_after_edits_agree_with_bfs(family):
+    rng = random.Random(family)
+    grid = mapgen.generate(family, SIZE, SIZE, 2).grid()
+    hmap = HierarchicalMap(grid, CLUSTER_SIZE)
+    for _ in range(30):
+        random_edit(hmap, rng)
+        start, goal = random_cell(rng), random_cell(rng)
+        path, _ = hmap.path(start, goal)
+        expected = bfs(start, [goal], grid, SIZE, SIZE)[0] if grid.is_passable(start) else []
+        if not expected or not grid.is_passable(goal):
+            assert path == []
+            continue
+        # HPA* paths are valid but may be a few steps longer than the shortest
+        assert_valid_path(grid, path, start, goal)
+        assert len(path) >= len(expected)
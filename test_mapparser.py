@@ -0,0 +1,15 @@
+import pytest
+from mapparser import MapParseError, parse_map
+
+HEADER = b"[5,11]\n(0,1)\n(7,0) | (10,3)\n"
+
+
+def test_every_wall_on_a_line_is_filled():
+    _, _, _, _, grid = parse_map(HEADER + b"(1,1,1,1) (2,2,2,1) // wall at (3,3)\n")
+    assert sorted(grid) == [(1, 1), (2, 2), (3, 2)]
+
+
+def test_malformed_later_wall_reports_its_column():
+    with pytest.raises(MapParseError) as error:
+        parse_map(HEADER + b"(1,1,1,1) (2,2,2)\n")
+    assert (error.value.line, error.value.column) == (4, 11)
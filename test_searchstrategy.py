@@ -0,0 +1,69 @@
+import random
+import pytest
+import mapgen
+from conftest import assert_valid_path
+from heuristic import HeuristicField
+from searchstrategy import bfs, bidirectional_a_star, bidirectional_bfs, ida_star, iddfs, jps, solve
+
+SIZES = (8, 17, 31)
+
+
+def random_queries(seed, count=20):
+    """Yield (grid, start, goal) pairs on generated maps, with random open endpoints."""
+    rng = random.Random(seed)
+    for family in mapgen.FAMILIES:
+        for size in SIZES:
+            grid = mapgen.generate(family, size, size + 3, seed).grid()
+            open_cells = [grid.cell(index) for index in range(grid.size) if not grid.cells[index]]
+            for _ in range(count):
+                yield grid, rng.choice(open_cells), rng.choice(open_cells)
+
+
+def check_against_bfs(search, seed):
+    for grid, start, goal in random_queries(seed):
+        expected = bfs(start, [goal], grid, grid.rows, grid.cols)[0]
+        path = search(start, [goal], grid, grid.rows, grid.cols)[0]
+        if not expected:
+            assert not path
+            continue
+        assert_valid_path(grid, path, start, goal)
+        assert len(path) == len(expected)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_jps_matches_bfs_length(seed):
+    check_against_bfs(jps, seed)
+
+
+@pytest.mark.parametrize("search", [bidirectional_bfs, bidirectional_a_star])
+@pytest.mark.parametrize("seed", range(3))
+def test_bidirectional_matches_bfs_length(search, seed):
+    check_against_bfs(search, seed)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_bidirectional_a_star_with_prebuilt_field(seed):
+    def search(start, goals, grid, rows, cols):
+        field = HeuristicField(grid, goals, "manhattan")
+        return bidirectional_a_star(start, goals, grid, rows, cols, heuristic=field)
+    check_against_bfs(search, seed)
+
+
+@pytest.mark.parametrize("search", [iddfs, ida_star])
+@pytest.mark.parametrize("seed", range(3))
+def test_iterative_deepening_matches_bfs_length(search, seed):
+    check_against_bfs(search, seed)
+
+
+@pytest.mark.parametrize("method", ["GBFS", "AS", "JPS", "CUS2"])
+@pytest.mark.parametrize("find_multiple_paths", [False, True])
+def test_prebuilt_heuristic_field_is_left_unchanged(method, find_multiple_paths):
+    spec = mapgen.generate("random", 20, 20, 0)
+    grid = spec.grid()
+    rng = random.Random(method)
+    goals = rng.sample([grid.cell(index) for index in range(grid.size) if not grid.cells[index]], 4)
+    field = HeuristicField(grid, goals, "distance")
+    values = list(field.values)
+    solve(method, spec.marker, goals, grid, grid.rows, grid.cols, find_multiple_paths, heuristic=field)
+    assert all(field.active)
+    assert list(field.values) == values
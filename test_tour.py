@@ -0,0 +1,56 @@
+import itertools
+import random
+import pytest
+import mapgen
+from searchstrategy import UNREACHED
+from tour import held_karp, nearest_neighbour, pairwise_distances, plan_tour, solve_tour, tour_length, two_opt
+
+# Methods that find a shortest path for every leg
+OPTIMAL_METHODS = ("BFS", "AS", "JPS", "BBFS", "BAS", "CUS1", "CUS2")
+
+
+def random_tour(seed, goal_count):
+    """(spec, grid, goals) on a small random map, with goals all reachable from the marker."""
+    rng = random.Random(seed)
+    spec = mapgen.generate("random", 14, 17, seed)
+    grid = spec.grid()
+    label = grid.component(spec.marker)
+    cells = [grid.cell(index) for index in range(grid.size) if grid.component(grid.cell(index)) == label]
+    return spec, grid, rng.sample(cells, goal_count)
+
+
+def brute_force(dist):
+    return min(tour_length(dist, order) for order in itertools.permutations(range(1, len(dist))))
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_held_karp_matches_permutations(seed):
+    spec, grid, goals = random_tour(seed, 6)
+    dist = pairwise_distances(grid, [spec.marker] + goals)
+    order, length = held_karp(dist)
+    assert sorted(order) == list(range(1, len(dist)))
+    assert length == tour_length(dist, order) == brute_force(dist)
+    # The heuristic tour for large goal sets is never shorter than the optimum
+    assert tour_length(dist, two_opt(dist, nearest_neighbour(dist))) >= length
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_plan_tour_skips_unreachable_goals(seed):
+    spec, grid, goals = random_tour(seed, 5)
+    walled = next(grid.cell(index) for index in range(grid.size) if grid.cells[index])
+    order, length, unreachable = plan_tour(spec.marker, goals + [walled], grid, grid.rows, grid.cols)
+    assert sorted(order) == sorted(goals)
+    assert unreachable == [walled]
+    dist = pairwise_distances(grid, [spec.marker] + goals)
+    assert length == brute_force(dist) < UNREACHED
+
+
+@pytest.mark.parametrize("method", OPTIMAL_METHODS)
+@pytest.mark.parametrize("seed", range(3))
+def test_solve_tour_follows_the_planned_length(method, seed):
+    spec, grid, goals = random_tour(seed, 5)
+    order, length, _ = plan_tour(spec.marker, goals, grid, grid.rows, grid.cols)
+    path, _, directions = solve_tour(method, spec.marker, goals, grid, grid.rows, grid.cols)[:3]
+    assert len(directions) == len(path) - 1 == length
+    visited = iter(path)
+    assert all(goal in visited for goal in order)  # Goals are reached in the planned order
@@ -0,0 +1,39 @@
+import random
+import pytest
+import mapgen
+import wavefront
+from wavefront import UNREACHED
+
+numpy = pytest.importorskip("numpy")
+
+SIZE = 48  # 2304 cells, above NUMPY_MIN_CELLS so wavefront() takes the NumPy path
+
+
+def check_parents(grid, sources, distance, parent):
+    for index in range(grid.size):
+        if index in sources or distance[index] == UNREACHED:
+            assert parent[index] == -1
+        else:
+            assert distance[parent[index]] + 1 == distance[index]
+            assert index in grid.neighbor_indices(parent[index])
+
+
+@pytest.mark.parametrize("family", mapgen.FAMILIES)
+@pytest.mark.parametrize("source_count", [1, 5])
+@pytest.mark.parametrize("small_frontier", [0, wavefront.SMALL_FRONTIER])
+def test_numpy_wavefront_matches_python(family, source_count, small_frontier, monkeypatch):
+    # SMALL_FRONTIER 0 expands every layer as index arrays, the default mixes both kinds of layer
+    monkeypatch.setattr(wavefront, "SMALL_FRONTIER", small_frontier)
+    grid = mapgen.generate(family, SIZE, SIZE, 4).grid()
+    assert grid.size >= wavefront.NUMPY_MIN_CELLS
+    rng = random.Random(source_count)
+    sources = rng.sample([index for index in range(grid.size) if not grid.cells[index]], source_count)
+    expected, _ = wavefront._python_wavefront(grid, sources, False)
+    distance, parent, owner = wavefront.wavefront(grid, sources, with_owner=True)
+    assert distance == expected
+    check_parents(grid, sources, distance, parent)
+    # Each cell's owner is one of its nearest sources
+    fields = [wavefront._python_wavefront(grid, [source], False)[0] for source in sources]
+    for index in range(grid.size):
+        if distance[index] != UNREACHED:
+            assert fields[owner[index]][index] == distance[index]
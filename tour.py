@@ -0,0 +1,164 @@
+from gridmap import as_grid
+from searchstrategy import UNREACHED, ITERATIVE_METHODS, solve, convert_path_to_directions
+from wavefront import distance_field
+
+# Largest number of goals ordered exactly with Held-Karp; bigger sets use nearest neighbour + 2-opt
+HELD_KARP_LIMIT = 12
+
+
+def pairwise_distances(grid, points, cache=None):
+    """Shortest path lengths between all (col, row) points, one BFS per point.
+
+    With a distcache.DistanceCache the fields are taken from, and kept in, the cache.
+    """
+    indices = [grid.index(point) for point in points]
+    matrix = []
+    for point, source in zip(points, indices):
+        distance = cache.field(grid, point)[0] if cache is not None else distance_field(grid, source)
+        matrix.append([distance[target] for target in indices])
+    return matrix
+
+
+def held_karp(dist):
+    """Exact shortest open tour that starts at node 0 and visits every other node.
+
+    Returns (order, cost) where order lists the visited nodes 1..n-1.
+    """
+    count = len(dist) - 1
+    if count == 0:
+        return [], 0
+    full = (1 << count) - 1
+    # cost[mask][last] = length of the best path from node 0 through the goals in mask, ending at last
+    cost = [[UNREACHED] * count for _ in range(full + 1)]
+    previous = [[-1] * count for _ in range(full + 1)]
+    for goal in range(count):
+        cost[1 << goal][goal] = dist[0][goal + 1]
+
+    for mask in range(1, full + 1):
+        row = cost[mask]
+        for last in range(count):
+            base = row[last]
+            if base >= UNREACHED or not mask & (1 << last):
+                continue
+            for goal in range(count):
+                bit = 1 << goal
+                if mask & bit:
+                    continue
+                candidate = base + dist[last + 1][goal + 1]
+                if candidate < cost[mask | bit][goal]:
+                    cost[mask | bit][goal] = candidate
+                    previous[mask | bit][goal] = last
+
+    last = min(range(count), key=lambda goal: cost[full][goal])
+    total = cost[full][last]
+    order = []
+    mask = full
+    while last != -1:
+        order.append(last + 1)
+        last, mask = previous[mask][last], mask & ~(1 << last)
+    order.reverse()
+    return order, total
+
+
+def tour_length(dist, order):
+    """Length of the open tour 0 -> order[0] -> ... -> order[-1]."""
+    total = 0
+    current = 0
+    for node in order:
+        total += dist[current][node]
+        current = node
+    return total
+
+
+def nearest_neighbour(dist):
+    """Greedy open tour from node 0, always moving to the closest unvisited node."""
+    unvisited = set(range(1, len(dist)))
+    order = []
+    current = 0
+    while unvisited:
+        current = min(unvisited, key=lambda node: (dist[current][node], node))
+        unvisited.remove(current)
+        order.append(current)
+    return order
+
+
+def two_opt(dist, order):
+    """Improve an open tour from node 0 by reversing segments until no reversal helps."""
+    order = list(order)
+    improved = True
+    while improved:
+        improved = False
+        for i in range(len(order) - 1):
+            before = order[i - 1] if i > 0 else 0
+            for j in range(i + 1, len(order)):
+                # Reversing order[i..j] replaces edges (before, order[i]) and (order[j], after)
+                after = order[j + 1] if j + 1 < len(order) else None
+                removed = dist[before][order[i]] + (dist[order[j]][after] if after is not None else 0)
+                added = dist[before][order[j]] + (dist[order[i]][after] if after is not None else 0)
+                if added < removed:
+                    order[i:j + 1] = reversed(order[i:j + 1])
+                    improved = True
+    return order
+
+
+def plan_tour(marker, goals, walls, rows, cols, cache=None):
+    """Order the goals for the shortest tour from the marker.
+
+    Returns (ordered reachable goals, tour length, unreachable goals). An
+    optional DistanceCache lets repeated plans on one map skip the BFS runs.
+    """
+    grid = as_grid(walls, rows, cols)
+    goals = list(dict.fromkeys(goals))  # Drop duplicates, keep order
+    dist = pairwise_distances(grid, [marker] + goals, cache)
+    reachable = [node for node in range(1, len(dist)) if dist[0][node] < UNREACHED]
+    unreachable = [goals[node - 1] for node in range(1, len(dist)) if dist[0][node] >= UNREACHED]
+
+    # Restrict the matrix to the marker and the goals it can reach
+    nodes = [0] + reachable
+    sub = [[dist[a][b] for b in nodes] for a in nodes]
+    if len(reachable) <= HELD_KARP_LIMIT:
+        order, length = held_karp(sub)
+    else:
+        order = two_opt(sub, nearest_neighbour(sub))
+        length = tour_length(sub, order)
+    return [goals[nodes[node] - 1] for node in order], length, unreachable
+
+
+def solve_tour(method, marker, goals, walls, rows, cols, observer=None, cache=None, **options):
+    """Visit every reachable goal in planned tour order, running method for each leg.
+
+    Returns the same tuple shape as the strategy itself, with node counts,
+    steps and iterations summed over the legs. Extra keyword options go to
+    every leg's strategy, see searchstrategy.solve. An optional DistanceCache
+    is used for the tour plan, see plan_tour.
+    """
+    grid = as_grid(walls, rows, cols)
+    order, _, _ = plan_tour(marker, goals, grid, rows, cols, cache)
+    full_path = []
+    node_count = 0
+    steps = []
+    iterations = 0
+    visited = None
+    start = marker
+    for goal in order:
+        result = solve(method, start, [goal], grid, rows, cols, False, observer, **options)
+        path = result[0]
+        if not path or path[-1] != goal:
+            break
+        if full_path and full_path[-1] == path[0]:
+            full_path.extend(path[1:])
+        else:
+            full_path.extend(path)
+        node_count += result[1]
+        visited = result[3]
+        steps.extend(result[4])
+        if method in ITERATIVE_METHODS:
+            iterations += result[5]
+        if observer:
+            observer("reset", goal)
+        start = goal
+
+    directions = convert_path_to_directions(full_path)
+    if method in ITERATIVE_METHODS:
+        return full_path, node_count, directions, visited, steps, iterations
+    return full_path, node_count, directions, visited, steps
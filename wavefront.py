@@ -0,0 +1,167 @@
+from array import array
+
+try:
+    import numpy
+except ImportError:  # NumPy is optional; the pure Python wavefront gives the same distances
+    numpy = None
+
+# Distance of cells that have not been reached; searchstrategy and heuristic import it from here
+UNREACHED = 2 ** 31 - 1
+
+# Grids smaller than this run the pure Python wavefront, NumPy's per-layer overhead does not pay off
+NUMPY_MIN_CELLS = 1024
+
+# Wavefront layers with fewer cells than this are expanded one cell at a time
+SMALL_FRONTIER = 64
+
+# Direction codes of direction_field(), in the RIGHT, DOWN, LEFT, UP neighbour order of Grid
+RIGHT, DOWN, LEFT, UP = 0, 1, 2, 3
+NO_DIRECTION = 255
+
+
+def wavefront(grid, sources, with_owner=False):
+    """Breadth-first distance and predecessor fields from flat source indices to every cell.
+
+    Returns (distance, parent) int arrays, UNREACHED and -1 for cells walled
+    off from every source, plus owner (the position in sources of each cell's
+    nearest source, -1 if none) when with_owner is set. With NumPy the layers
+    are expanded as whole index arrays, see _numpy_wavefront; distances are
+    identical either way, but among equally short routes the predecessor
+    picked may differ.
+    """
+    sources = [int(source) for source in sources]
+    if numpy is not None and grid.size >= NUMPY_MIN_CELLS:
+        return _numpy_wavefront(grid, sources, with_owner)
+    return _python_wavefront(grid, sources, with_owner)
+
+
+def _python_wavefront(grid, sources, with_owner):
+    distance = array('i', [UNREACHED]) * grid.size
+    parent = array('i', [-1]) * grid.size
+    owner = array('i', [-1]) * grid.size
+    queue = array('i')
+    for number, source in enumerate(sources):
+        if distance[source] != 0:
+            distance[source] = 0
+            owner[source] = number
+            queue.append(source)
+    head = 0
+    while head < len(queue):
+        index = queue[head]
+        head += 1
+        next_distance = distance[index] + 1
+        for neighbor in grid.neighbor_indices(index):
+            if distance[neighbor] == UNREACHED:
+                distance[neighbor] = next_distance
+                parent[neighbor] = index
+                owner[neighbor] = owner[index]
+                queue.append(neighbor)
+    return (distance, parent, owner) if with_owner else (distance, parent)
+
+
+def _numpy_wavefront(grid, sources, with_owner):
+    """Sparse-frontier BFS: each layer is a handful of gathers and scatters over the frontier's indices.
+
+    The grid is padded with a ring of walls so neighbours are plain index
+    offsets with no edge checks. Claiming the cells reached through each
+    direction before trying the next keeps every cell's first predecessor
+    in RIGHT, DOWN, LEFT, UP order, like Grid.neighbor_indices. Layers
+    narrower than SMALL_FRONTIER (long corridors, mazes) are cheaper to
+    expand cell by cell, so those run in Python over the same buffers.
+    """
+    rows, cols = grid.rows, grid.cols
+    width = cols + 2
+    # Python buffers with NumPy views on them, so both kinds of layer share the state
+    free_buffer = bytearray((rows + 2) * width)
+    distance_buffer = array('i', [UNREACHED]) * len(free_buffer)
+    parent_buffer = array('i', [-1]) * len(free_buffer)
+    owner_buffer = array('i', [-1]) * len(free_buffer)
+    free = numpy.frombuffer(free_buffer, dtype=bool)
+    distance = numpy.frombuffer(distance_buffer, dtype=numpy.int32)
+    parent = numpy.frombuffer(parent_buffer, dtype=numpy.int32)
+    owner = numpy.frombuffer(owner_buffer, dtype=numpy.int32)
+    free.reshape(rows + 2, width)[1:-1, 1:-1] = \
+        numpy.frombuffer(bytes(grid.cells), dtype=numpy.uint8).reshape(rows, cols) == 0
+
+    frontier = []
+    for number, source in enumerate(sources):
+        row, col = divmod(source, cols)
+        index = (row + 1) * width + col + 1
+        if distance_buffer[index] != 0:
+            free_buffer[index] = 0
+            distance_buffer[index] = 0
+            owner_buffer[index] = number
+            frontier.append(index)
+
+    # Moving from a cell to its RIGHT, DOWN, LEFT and UP neighbours
+    offsets = (1, width, -1, -width)
+    layer = 0
+    while len(frontier):
+        layer += 1
+        if len(frontier) < SMALL_FRONTIER:
+            frontier = frontier.tolist() if isinstance(frontier, numpy.ndarray) else frontier
+            reached = []
+            for offset in offsets:
+                for index in frontier:
+                    neighbor = index + offset
+                    if free_buffer[neighbor]:
+                        free_buffer[neighbor] = 0
+                        distance_buffer[neighbor] = layer
+                        parent_buffer[neighbor] = index
+                        owner_buffer[neighbor] = owner_buffer[index]
+                        reached.append(neighbor)
+            frontier = reached
+            continue
+        frontier = numpy.asarray(frontier, dtype=numpy.intp)
+        reached = []
+        for offset in offsets:
+            neighbors = frontier + offset
+            open_mask = free[neighbors]
+            neighbors = neighbors[open_mask]
+            if not neighbors.size:
+                continue
+            free[neighbors] = False
+            predecessors = frontier[open_mask]
+            parent[neighbors] = predecessors
+            if with_owner:
+                owner[neighbors] = owner[predecessors]
+            reached.append(neighbors)
+        frontier = numpy.concatenate(reached) if reached else frontier[:0]
+        distance[frontier] = layer
+
+    # Drop the padding and translate padded predecessor indices back to grid indices
+    inner = (slice(1, -1), slice(1, -1))
+    parent = parent.reshape(rows + 2, width)[inner].ravel()
+    has_parent = parent >= 0
+    parent[has_parent] = (parent[has_parent] // width - 1) * cols + parent[has_parent] % width - 1
+    result = (array('i', distance.reshape(rows + 2, width)[inner].tobytes()), array('i', parent.tobytes()))
+    if with_owner:
+        result += (array('i', owner.reshape(rows + 2, width)[inner].tobytes()),)
+    return result
+
+
+def distance_field(grid, source):
+    """Breadth-first distances (UNREACHED if walled off) from a cell index to every cell."""
+    return wavefront(grid, [source])[0]
+
+
+def direction_field(grid, parent):
+    """Direction code of the step from each cell's predecessor into it, NO_DIRECTION if it has none.
+
+    Following the opposite directions from any reached cell walks back to its source.
+    """
+    cols = grid.cols
+    if numpy is not None and grid.size >= NUMPY_MIN_CELLS:
+        parent = numpy.frombuffer(parent, dtype=numpy.int32)
+        step = numpy.arange(grid.size) - parent
+        codes = numpy.full(grid.size, NO_DIRECTION, dtype=numpy.uint8)
+        # Vertical steps last, so they win in a single column grid where cols == 1
+        for code, offset in ((RIGHT, 1), (LEFT, -1), (DOWN, cols), (UP, -cols)):
+            codes[(step == offset) & (parent >= 0)] = code
+        return bytearray(codes.tobytes())
+    codes = bytearray([NO_DIRECTION]) * grid.size
+    steps = {1: RIGHT, -1: LEFT, cols: DOWN, -cols: UP}
+    for index in range(grid.size):
+        if parent[index] >= 0:
+            codes[index] = steps[index - parent[index]]
+    return codes